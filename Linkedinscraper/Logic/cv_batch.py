@@ -0,0 +1,76 @@
+import os
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional
+from langgraph.cv_graph import cv_workflow, CVState
+from Logic.job_cache import get_or_cache_jobs
+from Logic.profile_store import profile_to_text
+
+CV_BATCH_CONCURRENCY = int(os.getenv("CV_BATCH_CONCURRENCY", "4"))
+
+
+def save_cv(output_dir: str, job_id: str, final_cv: str) -> str:
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"cv_{job_id}.md")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(final_cv)
+    os.replace(tmp_path, path)
+    return path
+
+
+async def generate_cvs(job_ids: List[str], cv_text: str, profile: Dict[str, Any],
+                       profile_text: Optional[str] = None, output_dir: Optional[str] = None,
+                       concurrency: int = CV_BATCH_CONCURRENCY) -> AsyncIterator[Dict[str, Any]]:
+    """Run the CV graph for many jobs at once, yielding progress events as they happen.
+
+    Every event has job_id, status ("started", "done" or "failed"), completed
+    and total; "done" events carry final_cv, score and, with output_dir, the
+    path the CV was written to. Jobs are fetched in one batch up front and the
+    profile text is rendered once for all runs.
+    """
+    job_ids = list(dict.fromkeys(str(job_id) for job_id in job_ids))
+    profile_text = profile_text or profile_to_text(profile)
+    jobs = await get_or_cache_jobs(job_ids)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    events: asyncio.Queue = asyncio.Queue()
+
+    async def run_one(job_id: str):
+        try:
+            async with semaphore:
+                await events.put({"job_id": job_id, "status": "started"})
+                job = jobs.get(job_id)
+                if not job:
+                    raise ValueError("could not fetch job details")
+                # Job already loaded, so the graph starts at AnalyzeCV
+                result = await cv_workflow.ainvoke(CVState(
+                    job_id=job_id,
+                    profile=profile,
+                    profile_text=profile_text,
+                    job=job,
+                    cv_text=cv_text,
+                    original_cv=cv_text,
+                    cv_suggestions=None,
+                    final_cv=None,
+                ))
+                event = {"job_id": job_id, "status": "done", "final_cv": result["final_cv"],
+                         "score": (result.get("cv_suggestions") or {}).get("score"),
+                         "title": job["job_info"].get("title"), "company": job["company_info"].get("name")}
+                if output_dir:
+                    event["path"] = await asyncio.to_thread(save_cv, output_dir, job_id, result["final_cv"])
+        except Exception as e:
+            print(f" ****** Error generating CV for job {job_id}: {e}")
+            event = {"job_id": job_id, "status": "failed", "error": str(e)}
+        await events.put(event)
+
+    tasks = [asyncio.create_task(run_one(job_id)) for job_id in job_ids]
+    completed = 0
+    try:
+        while completed < len(tasks):
+            event = await events.get()
+            if event["status"] != "started":
+                completed += 1
+            yield {**event, "completed": completed, "total": len(tasks)}
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,226 @@
+import os
+import re
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+import numpy as np
+import xxhash
+from agents.jobextractor import job_id_of
+from Logic.metrics import registry, record_cache, METRICS_ENABLED
+
+# --- Near-duplicate settings ---
+DEDUP_NUM_PERM = int(os.getenv("DEDUP_NUM_PERM", "128"))
+DEDUP_BANDS = int(os.getenv("DEDUP_BANDS", "16"))          # LSH bands; NUM_PERM / BANDS rows each
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))  # estimated Jaccard to count as a repost
+DEDUP_REUSE_ENTRIES = int(os.getenv("DEDUP_REUSE_ENTRIES", "10000"))
+# Shorter texts (e.g. an empty description) never group: any two of them look alike
+DEDUP_MIN_SHINGLES = int(os.getenv("DEDUP_MIN_SHINGLES", "20"))
+SHINGLE_SIZE = 5
+# Bumped when fingerprint_text changes, so stored signatures are rebuilt
+FINGERPRINT_VERSION = 1
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_rng = np.random.RandomState(1)
+# Fixed permutations (a*h + b) mod p; a < 2**31 keeps a*h inside uint64 for 32-bit h
+_PERM_A = _rng.randint(1, 1 << 31, size=DEDUP_NUM_PERM).astype(np.uint64)
+_PERM_B = _rng.randint(0, 1 << 31, size=DEDUP_NUM_PERM).astype(np.uint64)
+
+WORD_RE = re.compile(r"\w+")
+
+
+def fingerprint_text(job: Dict[str, Any]) -> str:
+    job_info = job.get("job_info") or {}
+    company = (job.get("company_info") or {}).get("name", "")
+    return f"{job_info.get('title') or ''}\n{company}\n{job_info.get('description') or ''}".lower()
+
+
+def shingles_of(text: str) -> Set[str]:
+    words = WORD_RE.findall(text)
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(max(1, len(words) - SHINGLE_SIZE + 1))}
+
+
+def minhash(shingles: Set[str]) -> np.ndarray:
+    """MinHash signature over word shingles, one xxhash per shingle."""
+    hashes = np.fromiter((xxhash.xxh32_intdigest(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+    permuted = (np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % _MERSENNE_PRIME
+    return permuted.min(axis=1)
+
+
+class DuplicateIndex:
+    """Groups reposted jobs: MinHash signatures with an LSH band index.
+
+    Every job maps to a canonical ID, the first job seen of its group.
+    Signatures persist in dedup.sqlite so the band index is rebuilt on start
+    without re-hashing any descriptions.
+    """
+
+    def __init__(self, cache_dir: str = "data", bands: int = DEDUP_BANDS, threshold: float = DEDUP_THRESHOLD):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.bands = bands
+        self.rows = DEDUP_NUM_PERM // bands
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._canonical: Dict[str, str] = {}
+        self._buckets: List[Dict[bytes, List[str]]] = [{} for _ in range(bands)]
+
+        self.db = sqlite3.connect(os.path.join(cache_dir, "dedup.sqlite"), check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS signatures ("
+            " job_id TEXT PRIMARY KEY,"
+            " canonical_id TEXT NOT NULL,"
+            " signature BLOB NOT NULL)"
+        )
+        if self.db.execute("PRAGMA user_version").fetchone()[0] < FINGERPRINT_VERSION:
+            self.db.execute("DELETE FROM signatures")
+            self.db.execute(f"PRAGMA user_version = {FINGERPRINT_VERSION}")
+        self.db.commit()
+        for job_id, canonical_id, blob in self.db.execute("SELECT job_id, canonical_id, signature FROM signatures"):
+            signature = np.frombuffer(blob, dtype=np.uint64)
+            if len(signature) == DEDUP_NUM_PERM:
+                self._insert(job_id, canonical_id, signature)
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def _insert(self, job_id: str, canonical_id: str, signature: np.ndarray):
+        self._signatures[job_id] = signature
+        self._canonical[job_id] = canonical_id
+        for band, key in self._band_keys(signature):
+            self._buckets[band].setdefault(key, []).append(job_id)
+
+    def _best_match(self, signature: np.ndarray) -> Tuple[Optional[str], float]:
+        candidates = {job_id for band, key in self._band_keys(signature) for job_id in self._buckets[band].get(key, ())}
+        best, best_similarity = None, 0.0
+        for job_id in candidates:
+            similarity = float(np.mean(self._signatures[job_id] == signature))
+            if similarity > best_similarity:
+                best, best_similarity = job_id, similarity
+        return best, best_similarity
+
+    def add(self, job_id: str, job: Dict[str, Any]) -> str:
+        """Index a job (once) and return its canonical ID."""
+        job_id = str(job_id)
+        if job_id in self._canonical:
+            return self._canonical[job_id]
+        shingles = shingles_of(fingerprint_text(job))
+        signature = minhash(shingles)
+        with self._lock:
+            if job_id in self._canonical:
+                return self._canonical[job_id]
+            match, similarity = self._best_match(signature) if len(shingles) >= DEDUP_MIN_SHINGLES else (None, 0.0)
+            canonical_id = self._canonical[match] if match and similarity >= self.threshold else job_id
+            self._insert(job_id, canonical_id, signature)
+            self.db.execute(
+                "INSERT OR REPLACE INTO signatures (job_id, canonical_id, signature) VALUES (?, ?, ?)",
+                (job_id, canonical_id, signature.tobytes()),
+            )
+            self.db.commit()
+        return canonical_id
+
+    def remove(self, job_ids: List[str]):
+        """Forget jobs (e.g. evicted from the job cache); their groups keep the same canonical ID."""
+        with self._lock:
+            removed = []
+            for job_id in map(str, job_ids):
+                signature = self._signatures.pop(job_id, None)
+                if signature is None:
+                    continue
+                del self._canonical[job_id]
+                for band, key in self._band_keys(signature):
+                    bucket = self._buckets[band].get(key, [])
+                    if job_id in bucket:
+                        bucket.remove(job_id)
+                    if not bucket:
+                        self._buckets[band].pop(key, None)
+                removed.append((job_id,))
+            if removed:
+                self.db.executemany("DELETE FROM signatures WHERE job_id = ?", removed)
+                self.db.commit()
+
+    def canonical_of(self, job_id: str) -> Optional[str]:
+        return self._canonical.get(str(job_id))
+
+    def groups(self) -> Dict[str, List[str]]:
+        """Canonical ID -> all job IDs in its group, for groups with reposts only."""
+        members: Dict[str, List[str]] = {}
+        for job_id, canonical_id in self._canonical.items():
+            members.setdefault(canonical_id, []).append(job_id)
+        return {canonical_id: ids for canonical_id, ids in members.items() if len(ids) > 1}
+
+    def __len__(self):
+        return len(self._canonical)
+
+
+_indexes: Dict[str, DuplicateIndex] = {}
+
+def get_duplicate_index(cache_dir: str = "data") -> DuplicateIndex:
+    if cache_dir not in _indexes:
+        _indexes[cache_dir] = DuplicateIndex(cache_dir)
+    return _indexes[cache_dir]
+
+
+# --- Reusing an analysis across reposts of the same job ---
+class AnalysisReuse:
+    """Analysis results keyed by (canonical job, CV), shared by every repost of that job."""
+
+    def __init__(self, max_entries: int = DEDUP_REUSE_ENTRIES):
+        self.max_entries = max_entries
+        self._results: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        # Keys being analyzed right now, so concurrent batches wait instead of repeating the call
+        self.inflight: Dict[Tuple[str, str], "asyncio.Future"] = {}
+        self.saved_calls = 0
+
+    @staticmethod
+    def cv_key(user_cv: str) -> str:
+        return hashlib.sha256(user_cv.encode("utf-8")).hexdigest()
+
+    async def key(self, job: Dict[str, Any], user_cv: str, index: DuplicateIndex) -> Tuple[str, str]:
+        job_id = job_id_of(job)
+        canonical_id = index.canonical_of(job_id)
+        if canonical_id is None:
+            # New to the index: hashing and the SQLite write stay off the event loop
+            canonical_id = await asyncio.to_thread(index.add, job_id, job)
+        return canonical_id, self.cv_key(user_cv)
+
+    def lookup(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        result = self._results.get(key)
+        if result is not None:
+            self._results.move_to_end(key)
+        return result
+
+    def store(self, key: Tuple[str, str], result: Dict[str, Any]):
+        self._results[key] = result
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    def clear(self):
+        self._results.clear()
+        self.saved_calls = 0
+
+    def reuse(self, result: Dict[str, Any], job: Dict[str, Any]) -> Dict[str, Any]:
+        """The analysis of another posting, relabelled for this repost."""
+        self.saved_calls += 1
+        record_cache("analysis_dedup", hit=True)
+        if METRICS_ENABLED:
+            registry.inc("dedup_saved_calls_total", help="LLM analyses skipped because the job was a repost")
+        if result["job_id"] == job_id_of(job):
+            return result
+        return {
+            **result,
+            "job_id": job_id_of(job),
+            "title": job["job_info"]["title"],
+            "company": job["company_info"]["name"],
+            "link": job["job_info"]["job_url"],
+            "prescore": job.get("prescore"),
+            "duplicate_of": result["job_id"],
+        }
+
+
+analysis_reuse = AnalysisReuse()
@@ -0,0 +1,225 @@
+import os
+import csv
+import json
+import time
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+HISTORY_DB = os.getenv("HISTORY_DB", os.path.join("data", "history.sqlite"))
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", "50"))
+EXPORT_CHUNK = 1000
+
+# Columns shown in lists and exports, in order
+HISTORY_FIELDS = ["id", "created_at", "source", "user_id", "job_id", "title", "company", "score", "summary",
+                  "required_skills", "cv_recommendations", "link"]
+
+
+@dataclass
+class HistoryFilter:
+    job_id: Optional[str] = None
+    company: Optional[str] = None
+    skill: Optional[str] = None
+    source: Optional[str] = None
+    min_score: Optional[int] = None
+    since: Optional[float] = None
+    until: Optional[float] = None
+
+    def query_parts(self) -> Tuple[str, str, List[Any], Dict[str, str]]:
+        """FROM clause, WHERE clause, parameters and the columns to order by.
+
+        A skill filter drives the query from analysis_skills, whose rows carry
+        created_at and score, so skill lists and top-N stay index-ordered.
+        """
+        if self.skill:
+            source = "analysis_skills s JOIN analyses a ON a.id = s.analysis_id"
+            clauses, params = ["s.skill = ?"], [self.skill.strip().lower()]
+            columns = {"created_at": "s.created_at", "id": "s.analysis_id", "score": "s.score"}
+        else:
+            source = "analyses a"
+            clauses, params = [], []
+            columns = {"created_at": "a.created_at", "id": "a.id", "score": "a.score"}
+
+        if self.job_id:
+            clauses.append("a.job_id = ?")
+            params.append(str(self.job_id))
+        if self.company:
+            clauses.append("a.company = ? COLLATE NOCASE")
+            params.append(self.company)
+        if self.source:
+            clauses.append("a.source = ?")
+            params.append(self.source)
+        if self.min_score is not None:
+            clauses.append(f"{columns['score']} >= ?")
+            params.append(int(self.min_score))
+        if self.since is not None:
+            clauses.append(f"{columns['created_at']} >= ?")
+            params.append(self.since)
+        if self.until is not None:
+            clauses.append(f"{columns['created_at']} < ?")
+            params.append(self.until)
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+        return source, where, params, columns
+
+
+class HistoryStore:
+    """Every analysis result, in one SQLite file with indexes for the History tab.
+
+    Lists page by (created_at, id) keyset instead of OFFSET, and exports walk a
+    cursor in chunks, so both stay fast and flat in memory at any history size.
+    """
+
+    def __init__(self, path: str = HISTORY_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        # Opened on first use, so importing the module never touches the disk
+        if self._db is None:
+            self._db = self._connect()
+        return self._db
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        db.row_factory = sqlite3.Row
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript("""
+            CREATE TABLE IF NOT EXISTS analyses (
+                id INTEGER PRIMARY KEY,
+                created_at REAL NOT NULL,
+                source TEXT NOT NULL,
+                user_id TEXT,
+                job_id TEXT,
+                title TEXT,
+                company TEXT,
+                score INTEGER,
+                summary TEXT,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS analysis_skills (
+                skill TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                analysis_id INTEGER NOT NULL,
+                score INTEGER,
+                PRIMARY KEY (skill, created_at, analysis_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS analysis_skills_score ON analysis_skills(skill, score);
+            CREATE INDEX IF NOT EXISTS analyses_job_id ON analyses(job_id);
+            CREATE INDEX IF NOT EXISTS analyses_company ON analyses(company COLLATE NOCASE, created_at);
+            CREATE INDEX IF NOT EXISTS analyses_company_score ON analyses(company COLLATE NOCASE, score);
+            CREATE INDEX IF NOT EXISTS analyses_score ON analyses(score, created_at);
+            CREATE INDEX IF NOT EXISTS analyses_created_at ON analyses(created_at, id);
+        """)
+        db.commit()
+        return db
+
+    # --- Writes ---
+    def record_many(self, results: Iterable[Dict[str, Any]], source: str, user_id: Optional[str] = None) -> List[int]:
+        """Store analysis results (dicts shaped like job_analysis.to_result); returns their IDs."""
+        ids = []
+        now = time.time()
+        with self._lock:
+            for result in results:
+                cursor = self.db.execute(
+                    "INSERT INTO analyses (created_at, source, user_id, job_id, title, company, score, summary, data)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (now, source, user_id, result.get("job_id"), result.get("title"), result.get("company"),
+                     result.get("score"), result.get("summary"), json.dumps(result, default=str)),
+                )
+                skills = {s.strip().lower() for s in result.get("required_skills") or [] if s and s.strip()}
+                self.db.executemany(
+                    "INSERT OR IGNORE INTO analysis_skills (skill, created_at, analysis_id, score) VALUES (?, ?, ?, ?)",
+                    [(skill, now, cursor.lastrowid, result.get("score")) for skill in skills],
+                )
+                ids.append(cursor.lastrowid)
+            self.db.commit()
+        return ids
+
+    def record(self, result: Dict[str, Any], source: str, user_id: Optional[str] = None) -> int:
+        return self.record_many([result], source, user_id)[0]
+
+    # --- Reads ---
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        entry = json.loads(row["data"])
+        entry.update({key: row[key] for key in ("id", "created_at", "source", "user_id", "job_id",
+                                                "title", "company", "score", "summary")})
+        return entry
+
+    def page(self, filters: Optional[HistoryFilter] = None, limit: int = HISTORY_PAGE_SIZE,
+             before: Optional[Tuple[float, int]] = None) -> Tuple[List[Dict[str, Any]], Optional[Tuple[float, int]]]:
+        """Newest first. Pass the returned cursor as `before` for the next page (None = last page)."""
+        source, where, params, columns = (filters or HistoryFilter()).query_parts()
+        created_at, row_id = columns["created_at"], columns["id"]
+        if before is not None:
+            where += (" AND " if where else " WHERE ") + f"({created_at}, {row_id}) < (?, ?)"
+            params += list(before)
+        rows = self.db.execute(
+            f"SELECT a.* FROM {source}{where} ORDER BY {created_at} DESC, {row_id} DESC LIMIT ?",
+            params + [limit + 1],
+        ).fetchall()
+        entries = [self._to_dict(row) for row in rows[:limit]]
+        cursor = (entries[-1]["created_at"], entries[-1]["id"]) if len(rows) > limit else None
+        return entries, cursor
+
+    def top(self, n: int = 10, filters: Optional[HistoryFilter] = None) -> List[Dict[str, Any]]:
+        source, where, params, columns = (filters or HistoryFilter()).query_parts()
+        rows = self.db.execute(
+            f"SELECT a.* FROM {source}{where} ORDER BY {columns['score']} DESC LIMIT ?",
+            params + [n],
+        ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def get_many(self, ids: List[int]) -> List[Dict[str, Any]]:
+        if not ids:
+            return []
+        marks = ",".join("?" * len(ids))
+        rows = {row["id"]: row for row in self.db.execute(f"SELECT * FROM analyses WHERE id IN ({marks})", ids)}
+        return [self._to_dict(rows[i]) for i in ids if i in rows]
+
+    def compare(self, ids: List[int], fields: Optional[List[str]] = None) -> Dict[str, List[Any]]:
+        """Field -> one value per analysis, in the order of `ids`, for a side-by-side view."""
+        entries = self.get_many(ids)
+        fields = fields or ["id", "title", "company", "score", "source", "summary", "required_skills",
+                            "matched_skills", "missing_skills", "cv_recommendations", "link"]
+        return {field: [entry.get(field) for entry in entries] for field in fields}
+
+    def count(self, filters: Optional[HistoryFilter] = None) -> int:
+        source, where, params, _ = (filters or HistoryFilter()).query_parts()
+        return self.db.execute(f"SELECT COUNT(*) FROM {source}{where}", params).fetchone()[0]
+
+    # --- Export ---
+    def iter_entries(self, filters: Optional[HistoryFilter] = None) -> Iterator[Dict[str, Any]]:
+        """Every matching analysis, oldest first, read in chunks from a dedicated cursor."""
+        source, where, params, columns = (filters or HistoryFilter()).query_parts()
+        cursor = self.db.execute(
+            f"SELECT a.* FROM {source}{where} ORDER BY {columns['created_at']}, {columns['id']}", params)
+        while True:
+            rows = cursor.fetchmany(EXPORT_CHUNK)
+            if not rows:
+                return
+            for row in rows:
+                yield self._to_dict(row)
+
+    def export(self, path: str, filters: Optional[HistoryFilter] = None) -> int:
+        """Write matching analyses to a .csv or .jsonl file; returns how many were written."""
+        written = 0
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            if path.endswith(".csv"):
+                writer = csv.DictWriter(f, fieldnames=HISTORY_FIELDS, extrasaction="ignore")
+                writer.writeheader()
+                for entry in self.iter_entries(filters):
+                    writer.writerow({k: "; ".join(v) if isinstance(v, list) else v for k, v in entry.items()})
+                    written += 1
+            else:
+                for entry in self.iter_entries(filters):
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                    written += 1
+        return written
+
+
+history_store = HistoryStore()
@@ -0,0 +1,242 @@
+import os
+import asyncio
+from typing import Dict, Any, List, Optional, Union
+from agents.jobextractor import job_id_of
+from agents.jobanalyser import job_analyser_agent, job_scorer_agent
+from Logic.metrics import record_retry, record_cache, record_cascade
+from Logic.dedup import DuplicateIndex, analysis_reuse, get_duplicate_index
+from Logic.prompts import build_cv_analysis_prompt, build_packed_analysis_prompt, build_score_prompt
+
+# --- Fan-out settings for per-job analysis ---
+ANALYSIS_CONCURRENCY = int(os.getenv("ANALYSIS_CONCURRENCY", "5"))
+ANALYSIS_MAX_RETRIES = int(os.getenv("ANALYSIS_MAX_RETRIES", "3"))
+ANALYSIS_RETRY_BACKOFF = float(os.getenv("ANALYSIS_RETRY_BACKOFF", "1.0"))
+# Jobs packed into one LLM request; 1 keeps one request per job
+ANALYSIS_BATCH_SIZE = int(os.getenv("ANALYSIS_BATCH_SIZE", "1"))
+
+# --- Cascade: a score-only pass first, full analysis only for jobs worth it ---
+ANALYSIS_CASCADE = int(os.getenv("ANALYSIS_CASCADE", "0"))
+# Scores at or above the threshold, or inside the uncertain band, get the full analysis
+CASCADE_DETAIL_THRESHOLD = int(os.getenv("CASCADE_DETAIL_THRESHOLD", "70"))
+CASCADE_UNCERTAIN_LOW = int(os.getenv("CASCADE_UNCERTAIN_LOW", "55"))
+CASCADE_UNCERTAIN_HIGH = int(os.getenv("CASCADE_UNCERTAIN_HIGH", "69"))
+
+
+def to_result(job: Dict[str, Any], output) -> Dict[str, Any]:
+    return {
+        "job_id": job_id_of(job),
+        "title": job['job_info']['title'],
+        "company": job['company_info']['name'],
+        "score": output.score,
+        "summary": output.summary,
+        "required_skills": output.required_skills,
+        "cv_recommendations": output.cv_recommendations,
+        "link": job['job_info']['job_url'],
+        "prescore": job.get("prescore"),
+        "tier": "detail",
+    }
+
+def to_score_result(job: Dict[str, Any], score: int) -> Dict[str, Any]:
+    """Result for a job that stopped after the score-only pass."""
+    return {
+        "job_id": job_id_of(job),
+        "title": job['job_info']['title'],
+        "company": job['company_info']['name'],
+        "score": score,
+        "summary": "",
+        "required_skills": [],
+        "cv_recommendations": [],
+        "link": job['job_info']['job_url'],
+        "prescore": job.get("prescore"),
+        "tier": "score",
+    }
+
+async def with_retry(make_call, stage: str = "analyze_job"):
+    """Call make_call(refresh) until it succeeds; retries bypass the LLM cache."""
+    for attempt in range(ANALYSIS_MAX_RETRIES):
+        try:
+            return await make_call(attempt > 0)
+        except Exception:
+            if attempt == ANALYSIS_MAX_RETRIES - 1:
+                raise
+            record_retry(stage)
+            await asyncio.sleep(ANALYSIS_RETRY_BACKOFF * (2 ** attempt))
+
+async def analyze_one_job(job: Dict[str, Any], user_cv: str, refresh: bool = False) -> Dict[str, Any]:
+    full_input = build_cv_analysis_prompt(job, user_cv)
+
+    result = await job_analyser_agent.run(full_input, refresh=refresh)
+
+    return to_result(job, result.output[0])
+
+async def analyze_with_retry(job: Dict[str, Any], user_cv: str, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+    async with semaphore:
+        return await with_retry(lambda refresh: analyze_one_job(job, user_cv, refresh))
+
+# --- Packed mode: several jobs and the CV in one request ---
+async def analyze_packed(jobs: List[Dict[str, Any]], user_cv: str,
+                         refresh: bool = False) -> Dict[str, Dict[str, Any]]:
+    """One request for all jobs; returns results only for entries that map cleanly to a job ID."""
+    result = await job_analyser_agent.run(build_packed_analysis_prompt(jobs, user_cv), refresh=refresh,
+                                          validate=lambda output: len(output) == len(jobs))
+    return map_outputs(jobs, result.output, to_result)
+
+def map_outputs(jobs: List[Dict[str, Any]], outputs: List[Any], convert) -> Dict[str, Any]:
+    """Match packed outputs to jobs by job ID (or by position when every ID was dropped)."""
+    jobs_by_id = {job_id_of(job): job for job in jobs}
+    if len(outputs) == len(jobs) and all(not output.job_id for output in outputs):
+        # Model dropped the IDs but kept the order and count
+        return {job_id: convert(job, output) for (job_id, job), output in zip(jobs_by_id.items(), outputs)}
+
+    mapped = {}
+    for output in outputs:
+        job_id = str(output.job_id or "").strip()
+        if job_id in jobs_by_id and job_id not in mapped:
+            mapped[job_id] = convert(jobs_by_id[job_id], output)
+    return mapped
+
+async def analyze_detailed(jobs: List[Dict[str, Any]], user_cv: str,
+                           semaphore: asyncio.Semaphore) -> List[Union[Dict[str, Any], Exception]]:
+    """Analyze a batch in one packed call, falling back to single-job calls for anything missing.
+
+    Results are aligned with `jobs`; a job that still fails is returned as its exception.
+    """
+    if len(jobs) == 1:
+        singles = await asyncio.gather(analyze_with_retry(jobs[0], user_cv, semaphore), return_exceptions=True)
+        return list(singles)
+
+    mapped: Dict[str, Dict[str, Any]] = {}
+    try:
+        async with semaphore:
+            mapped = await with_retry(lambda refresh: analyze_packed(jobs, user_cv, refresh),
+                                    stage="analyze_packed")
+    except Exception as e:
+        print(f" ****** Packed analysis failed, falling back to single-job calls: {e}")
+
+    missing = [job for job in jobs if job_id_of(job) not in mapped]
+    singles = await asyncio.gather(
+        *(analyze_with_retry(job, user_cv, semaphore) for job in missing),
+        return_exceptions=True,
+    )
+    for job, single in zip(missing, singles):
+        mapped[job_id_of(job)] = single
+    return [mapped[job_id_of(job)] for job in jobs]
+
+# --- Cascade tiers ---
+def needs_detail(score: Optional[int]) -> bool:
+    if score is None:
+        # No usable score from the first pass; let the full analysis decide
+        return True
+    return score >= CASCADE_DETAIL_THRESHOLD or CASCADE_UNCERTAIN_LOW <= score <= CASCADE_UNCERTAIN_HIGH
+
+async def score_jobs(jobs: List[Dict[str, Any]], user_cv: str, semaphore: asyncio.Semaphore) -> Dict[str, int]:
+    """Score-only pass over the whole batch in one call; jobs it could not score are left out."""
+    async def run(refresh: bool):
+        result = await job_scorer_agent.run(build_score_prompt(jobs, user_cv), refresh=refresh,
+                                            validate=lambda output: len(output) == len(jobs))
+        return map_outputs(jobs, result.output, lambda job, output: output.score)
+
+    try:
+        async with semaphore:
+            return await with_retry(run, stage="score_jobs")
+    except Exception as e:
+        print(f" ****** Score pass failed, sending the batch to full analysis: {e}")
+        return {}
+
+async def analyze_cascade(jobs: List[Dict[str, Any]], user_cv: str,
+                          semaphore: asyncio.Semaphore) -> List[Union[Dict[str, Any], Exception]]:
+    """Score every job cheaply, then run the full analysis only where needs_detail() says so.
+
+    Jobs that stop after the first pass get to_score_result(); escalated ones keep
+    their first-pass score as "quick_score".
+    """
+    scores = await score_jobs(jobs, user_cv, semaphore)
+    escalate = [job for job in jobs if needs_detail(scores.get(job_id_of(job)))]
+    detailed = dict(zip(map(job_id_of, escalate), await analyze_detailed(escalate, user_cv, semaphore))) if escalate else {}
+    record_cascade("score", len(jobs) - len(escalate))
+    record_cascade("detail", len(escalate))
+
+    results: List[Union[Dict[str, Any], Exception]] = []
+    for job in jobs:
+        job_id = job_id_of(job)
+        if job_id not in detailed:
+            results.append(to_score_result(job, scores[job_id]))
+        elif isinstance(detailed[job_id], Exception):
+            results.append(detailed[job_id])
+        else:
+            results.append({**detailed[job_id], "quick_score": scores.get(job_id)})
+    return results
+
+async def analyze_unique(jobs: List[Dict[str, Any]], user_cv: str,
+                         semaphore: asyncio.Semaphore) -> List[Union[Dict[str, Any], Exception]]:
+    """Results aligned with `jobs`, through the cascade when ANALYSIS_CASCADE is on."""
+    if ANALYSIS_CASCADE:
+        return await analyze_cascade(jobs, user_cv, semaphore)
+    return await analyze_detailed(jobs, user_cv, semaphore)
+
+# --- Reposts: one analysis per distinct posting and CV ---
+async def analyze_batch(jobs: List[Dict[str, Any]], user_cv: str, semaphore: asyncio.Semaphore,
+                        dedup_index: Optional[DuplicateIndex] = None) -> List[Union[Dict[str, Any], Exception]]:
+    """Like analyze_unique, but near-duplicate postings (Logic/dedup.py) share one analysis.
+
+    Reposts seen earlier, or being analyzed by another batch right now, reuse
+    that result; within the batch only one job per duplicate group is sent.
+    `dedup_index` defaults to the one next to the default job cache.
+    """
+    if dedup_index is None:
+        dedup_index = get_duplicate_index()
+    keys = [await analysis_reuse.key(job, user_cv, dedup_index) for job in jobs]
+    known = {key: analysis_reuse.lookup(key) for key in keys}
+    known = {key: result for key, result in known.items() if result is not None}
+
+    loop = asyncio.get_running_loop()
+    mine: Dict[Any, Dict[str, Any]] = {}
+    theirs: Dict[Any, asyncio.Future] = {}
+    for job, key in zip(jobs, keys):
+        if key in known or key in mine or key in theirs:
+            continue
+        if key in analysis_reuse.inflight:
+            theirs[key] = analysis_reuse.inflight[key]
+        else:
+            mine[key] = job
+            analysis_reuse.inflight[key] = loop.create_future()
+    record_cache("analysis_dedup", hit=False, count=len(mine))
+
+    fresh: Dict[Any, Union[Dict[str, Any], Exception]] = {}
+    try:
+        results = await analyze_unique(list(mine.values()), user_cv, semaphore) if mine else []
+        fresh = dict(zip(mine, results))
+    finally:
+        for key in mine:
+            result = fresh.get(key)
+            ok = result is not None and not isinstance(result, Exception)
+            if ok:
+                analysis_reuse.store(key, result)
+            analysis_reuse.inflight.pop(key).set_result(result if ok else None)
+
+    for key, future in theirs.items():
+        result = await future
+        if result is not None:
+            known[key] = result
+
+    # Another batch failed on these; try them here once more
+    retry = {key: job for job, key in zip(jobs, keys) if key in theirs and key not in known}
+    if retry:
+        results = await analyze_unique(list(retry.values()), user_cv, semaphore)
+        for key, result in zip(retry, results):
+            fresh[key] = result
+            if not isinstance(result, Exception):
+                analysis_reuse.store(key, result)
+
+    out: List[Union[Dict[str, Any], Exception]] = []
+    for job, key in zip(jobs, keys):
+        result = known.get(key, fresh.get(key))
+        if isinstance(result, Exception) or (mine.get(key) or retry.get(key)) is job:
+            out.append(result)
+        else:
+            out.append(analysis_reuse.reuse(result, job))
+    return out
+
+def chunked(items: List[Any], size: int) -> List[List[Any]]:
+    size = max(1, size)
+    return [items[i:i + size] for i in range(0, len(items), size)]
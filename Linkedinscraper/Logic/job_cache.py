@@ -1,21 +1,368 @@
 import os
 import json
-from agents.jobextractor import get_job_details_by_id
+import time
+import sqlite3
+import atexit
+import asyncio
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from agents.jobextractor import fetch_jobs, job_id_of
+from Logic.metrics import span, record_cache
+from Logic.job_codec import JobCodec, UnknownDictionary
 
-def get_or_cache_job(job_id: str, cache_dir="data") -> dict | None:
-    os.makedirs(cache_dir, exist_ok=True)
-    cache_path = os.path.join(cache_dir, f"job_{job_id}.json")
+# --- Cache settings ---
+CACHE_TTL_SECONDS = float(os.getenv("JOB_CACHE_TTL", str(7 * 24 * 3600)))
+CACHE_MAX_ENTRIES = int(os.getenv("JOB_CACHE_MAX_ENTRIES", "50000"))
+CACHE_MEMORY_ENTRIES = int(os.getenv("JOB_CACHE_MEMORY_ENTRIES", "1000"))
+# Train the compression dictionary once this many jobs are cached (0 = only on demand)
+CACHE_DICT_TRAIN_AT = int(os.getenv("JOB_CACHE_DICT_TRAIN_AT", "500"))
+# Access times are batched in memory and written at most this often (seconds)
+CACHE_TOUCH_FLUSH_SECONDS = float(os.getenv("JOB_CACHE_TOUCH_FLUSH", "5"))
 
-    if os.path.exists(cache_path):
-        with open(cache_path, "r", encoding="utf-8") as f:
-            return json.load(f)
 
-    # Fetch from API
-    job_data = get_job_details_by_id([job_id])
-    if not job_data:
-        return None
+class JobCache:
+    """Two-tier job cache: in-process LRU in front of one SQLite file."""
 
-    with open(cache_path, "w", encoding="utf-8") as f:
-        json.dump(job_data[0], f, indent=2)
+    def __init__(self, cache_dir: str = "data", ttl: float = CACHE_TTL_SECONDS,
+                 max_entries: int = CACHE_MAX_ENTRIES, memory_entries: int = CACHE_MEMORY_ENTRIES):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._touched: Dict[str, float] = {}
+        self._last_flush = time.time()
+        self._training: Optional[asyncio.Task] = None
+        self._train_failed = False
 
-    return job_data[0]
+        self.db = sqlite3.connect(os.path.join(cache_dir, "job_cache.sqlite"), check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " job_id TEXT PRIMARY KEY,"
+            " data BLOB NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS jobs_accessed_at ON jobs(accessed_at)")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS dictionaries ("
+            " dict_id INTEGER PRIMARY KEY,"
+            " data BLOB NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self.db.commit()
+
+        # Every dictionary stays loaded so older rows remain readable; the newest one encodes
+        self.codec = JobCodec()
+        self._load_dictionaries()
+        # Kept up to date by put/_evict; recounted only when eviction looks due
+        self._row_count = self._count()
+        atexit.register(self.flush_touches)
+
+    # --- Side indexes, imported on first put so startup does not load numpy ---
+    @property
+    def index(self):
+        from Logic.job_index import get_job_index
+        return get_job_index(self.cache_dir)
+
+    @property
+    def dedup(self):
+        from Logic.dedup import get_duplicate_index
+        return get_duplicate_index(self.cache_dir)
+
+    # --- Encoding of stored rows ---
+    def _encode(self, job: dict) -> bytes:
+        return self.codec.encode(job)
+
+    def _decode(self, data: bytes, header_only: bool = False) -> dict:
+        decode = self.codec.decode_header if header_only else self.codec.decode
+        try:
+            return decode(data)
+        except UnknownDictionary:
+            # Trained by another process after this one opened the cache
+            if not self._load_dictionaries():
+                raise
+            return decode(data)
+
+    def _load_dictionaries(self) -> int:
+        """Load dictionaries not seen yet, oldest first, so the newest encodes; returns how many."""
+        added = 0
+        for dict_id, data in self.db.execute("SELECT dict_id, data FROM dictionaries ORDER BY created_at"):
+            if not self.codec.has_dictionary(dict_id):
+                self.codec.add_dictionary(data)
+                added += 1
+        return added
+
+    def _sample_rows(self, samples: int) -> List[bytes]:
+        return [row[0] for row in self.db.execute("SELECT data FROM jobs ORDER BY RANDOM() LIMIT ?", (samples,))]
+
+    def train_dictionary(self, samples: int = 2000) -> int:
+        """Train a zstd dictionary on a random sample of cached jobs and use it for new rows."""
+        data = JobCodec.train_dictionary([self._decode(row) for row in self._sample_rows(samples)])
+        return self._install_dictionary(data)
+
+    async def _train_in_background(self, samples: int = 2000):
+        try:
+            rows = self._sample_rows(samples)
+            # No dictionary exists yet, so a fresh codec decodes the samples off the event loop
+            data = await asyncio.to_thread(
+                lambda: JobCodec.train_dictionary([JobCodec().decode(row) for row in rows]))
+            self._install_dictionary(data)
+        except Exception as e:
+            # Not retried on every put; migrate_cache.py can still train one explicitly
+            self._train_failed = True
+            print(f" ****** Error training the job cache dictionary: {e}")
+
+    def _maybe_train(self):
+        if self.codec.dict_id or self._train_failed or not CACHE_DICT_TRAIN_AT \
+                or self._row_count < CACHE_DICT_TRAIN_AT:
+            return
+        if self._training is not None and not self._training.done():
+            return
+        # Another process may have trained one already
+        if self._load_dictionaries():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Scripts outside an event loop can afford to train right here
+            try:
+                self.train_dictionary()
+            except Exception as e:
+                self._train_failed = True
+                print(f" ****** Error training the job cache dictionary: {e}")
+            return
+        self._training = loop.create_task(self._train_in_background())
+
+    def _install_dictionary(self, data: bytes) -> int:
+        dict_id = self.codec.add_dictionary(data)
+        self.db.execute("INSERT OR REPLACE INTO dictionaries (dict_id, data, created_at) VALUES (?, ?, ?)",
+                        (dict_id, data, time.time()))
+        self.db.commit()
+        return dict_id
+
+    def recompress(self, chunk: int = 500) -> int:
+        """Re-encode every row with the current codec and dictionary; returns rows rewritten."""
+        rewritten = 0
+        all_ids = self.job_ids()
+        for start in range(0, len(all_ids), chunk):
+            ids = all_ids[start:start + chunk]
+            marks = ",".join("?" * len(ids))
+            rows = self.db.execute(f"SELECT job_id, data FROM jobs WHERE job_id IN ({marks})", ids).fetchall()
+            self.db.executemany("UPDATE jobs SET data = ? WHERE job_id = ?",
+                                [(self._encode(self._decode(data)), job_id) for job_id, data in rows])
+            self.db.commit()
+            rewritten += len(rows)
+        return rewritten
+
+    def migrate_legacy(self, remove: bool = False) -> int:
+        """Move every data/job_<id>.json into the store; returns how many were imported."""
+        imported = 0
+        for job_id in self.legacy_job_ids():
+            if self._select(job_id) is None and self._load_legacy(job_id):
+                imported += 1
+            if remove and self._select(job_id) is not None:
+                os.remove(os.path.join(self.cache_dir, f"job_{job_id}.json"))
+        return imported
+
+    def _is_fresh(self, fetched_at: float) -> bool:
+        return time.time() - fetched_at < self.ttl
+
+    # --- Memory tier ---
+    def _remember(self, job_id: str, fetched_at: float, job: dict):
+        self._memory[job_id] = (fetched_at, job)
+        self._memory.move_to_end(job_id)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    # --- Access times: batched, so a read never leaves a write transaction open ---
+    def _touch(self, job_id: str):
+        now = time.time()
+        self._touched[job_id] = now
+        if now - self._last_flush >= CACHE_TOUCH_FLUSH_SECONDS:
+            self.flush_touches()
+
+    def flush_touches(self):
+        self._last_flush = time.time()
+        if not self._touched:
+            return
+        touched, self._touched = self._touched, {}
+        self.db.executemany("UPDATE jobs SET accessed_at = ? WHERE job_id = ?",
+                            [(accessed_at, job_id) for job_id, accessed_at in touched.items()])
+        self.db.commit()
+
+    # --- Disk tier ---
+    def _load_legacy(self, job_id: str) -> bool:
+        # Pick up old one-file-per-job entries and move them into the store
+        legacy_path = os.path.join(self.cache_dir, f"job_{job_id}.json")
+        if not os.path.exists(legacy_path):
+            return False
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                job = json.load(f)
+        except ValueError:
+            return False
+        self.put(job_id, job, fetched_at=os.path.getmtime(legacy_path))
+        return True
+
+    def _select(self, job_id: str):
+        return self.db.execute(
+            "SELECT data, fetched_at FROM jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+
+    def contains(self, job_id: str) -> bool:
+        """True if a fresh copy is cached; nothing is decoded or fetched."""
+        job_id = str(job_id)
+        cached = self._memory.get(job_id)
+        if cached and self._is_fresh(cached[0]):
+            return True
+        row = self.db.execute("SELECT fetched_at FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return row is not None and self._is_fresh(row[0])
+
+    def peek(self, job_id: str) -> Optional[dict]:
+        """Cached job without job_info.description, for callers that only need titles and names."""
+        job_id = str(job_id)
+        cached = self._memory.get(job_id)
+        if cached and self._is_fresh(cached[0]):
+            return cached[1]
+        row = self._select(job_id)
+        if row is None or not self._is_fresh(row[1]):
+            return self.get(job_id)
+        return self._decode(row[0], header_only=True)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Return a fresh cached job or None, without touching the network."""
+        job_id = str(job_id)
+        cached = self._memory.get(job_id)
+        if cached and self._is_fresh(cached[0]):
+            self._memory.move_to_end(job_id)
+            self._touch(job_id)
+            return cached[1]
+
+        row = self._select(job_id)
+        if row is None and self._load_legacy(job_id):
+            row = self._select(job_id)
+        if row is None or not self._is_fresh(row[1]):
+            return None
+
+        self._touch(job_id)
+        job = self._decode(row[0])
+        self._remember(job_id, row[1], job)
+        return job
+
+    def put(self, job_id: str, job: dict, fetched_at: Optional[float] = None):
+        job_id = str(job_id)
+        fetched_at = fetched_at or time.time()
+        is_new = not self._exists(job_id)
+        self.db.execute(
+            "INSERT OR REPLACE INTO jobs (job_id, data, fetched_at, accessed_at) VALUES (?, ?, ?, ?)",
+            (job_id, self._encode(job), fetched_at, time.time()),
+        )
+        self._row_count += is_new
+        # Pending access times go in first, so eviction sees the real hot set
+        self.flush_touches()
+        evicted = self._evict()
+        self.db.commit()
+        self._remember(job_id, fetched_at, job)
+        self._maybe_train()
+        self.index.add(job_id, job)
+        self.dedup.add(job_id, job)
+        if evicted:
+            for evicted_id in evicted:
+                self._memory.pop(evicted_id, None)
+            self.index.remove(evicted)
+            self.dedup.remove(evicted)
+
+    def _count(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def _exists(self, job_id: str) -> bool:
+        return self.db.execute("SELECT 1 FROM jobs WHERE job_id = ?", (job_id,)).fetchone() is not None
+
+    def _evict(self) -> List[str]:
+        """Delete the least recently used rows over max_entries; returns their IDs."""
+        if self._row_count <= self.max_entries:
+            return []
+        # Other processes write to the same file, so confirm with a real count before deleting
+        self._row_count = self._count()
+        overflow = self._row_count - self.max_entries
+        if overflow <= 0:
+            return []
+        evicted = [row[0] for row in self.db.execute(
+            "SELECT job_id FROM jobs ORDER BY accessed_at LIMIT ?", (overflow,))]
+        self.db.executemany("DELETE FROM jobs WHERE job_id = ?", [(job_id,) for job_id in evicted])
+        self._row_count -= len(evicted)
+        return evicted
+
+    def job_ids(self) -> List[str]:
+        return [row[0] for row in self.db.execute("SELECT job_id FROM jobs")]
+
+    def legacy_job_ids(self) -> List[str]:
+        """IDs of old data/job_<id>.json files (imported on first get())."""
+        return [name[len("job_"):-len(".json")] for name in os.listdir(self.cache_dir)
+                if name.startswith("job_") and name.endswith(".json")]
+
+    # --- Fetch-through lookups ---
+    async def get_many(self, job_ids: List[str]) -> Dict[str, Optional[dict]]:
+        """Look up many IDs; misses are fetched together in one upstream call."""
+        job_ids = [str(job_id) for job_id in job_ids]
+        results: Dict[str, Optional[dict]] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        misses: List[str] = []
+
+        for job_id in dict.fromkeys(job_ids):
+            job = self.get(job_id)
+            if job is not None:
+                results[job_id] = job
+            elif job_id in self._inflight:
+                # Another caller is already fetching this ID
+                waiting[job_id] = self._inflight[job_id]
+            else:
+                misses.append(job_id)
+
+        record_cache("job_cache", hit=True, count=len(results))
+        record_cache("job_cache", hit=False, count=len(misses) + len(waiting))
+
+        if misses:
+            loop = asyncio.get_running_loop()
+            for job_id in misses:
+                self._inflight[job_id] = loop.create_future()
+            fetched: Dict[str, dict] = {}
+            try:
+                with span("job_cache.fetch_misses", jobs=len(misses)):
+                    jobs = await fetch_jobs(misses)
+                for job in jobs:
+                    fetched[job_id_of(job)] = job
+                    self.put(job_id_of(job), job)
+            finally:
+                for job_id in misses:
+                    future = self._inflight.pop(job_id)
+                    future.set_result(fetched.get(job_id))
+                    results[job_id] = fetched.get(job_id)
+
+        for job_id, future in waiting.items():
+            results[job_id] = await future
+
+        return {job_id: results.get(job_id) for job_id in job_ids}
+
+    async def get_or_fetch(self, job_id: str) -> Optional[dict]:
+        return (await self.get_many([job_id]))[str(job_id)]
+
+
+_caches: Dict[str, JobCache] = {}
+
+def get_job_cache(cache_dir: str = "data") -> JobCache:
+    if cache_dir not in _caches:
+        _caches[cache_dir] = JobCache(cache_dir)
+    return _caches[cache_dir]
+
+
+async def get_or_cache_job(job_id: str, cache_dir="data") -> dict | None:
+    return await get_job_cache(cache_dir).get_or_fetch(job_id)
+
+
+async def get_or_cache_jobs(job_ids: List[str], cache_dir="data") -> Dict[str, Optional[dict]]:
+    return await get_job_cache(cache_dir).get_many(job_ids)
@@ -0,0 +1,137 @@
+import os
+import json
+import struct
+from typing import Any, Dict, List, Tuple
+
+# --- Codec settings ---
+JOB_CACHE_CODEC = os.getenv("JOB_CACHE_CODEC", "zstd")   # "zstd" or "json"
+JOB_CODEC_LEVEL = int(os.getenv("JOB_CODEC_LEVEL", "6"))
+JOB_DICT_SIZE = int(os.getenv("JOB_DICT_SIZE", str(64 * 1024)))
+
+ZSTD_TAG = b"Z"
+_HEADER_LEN = struct.Struct("<I")
+
+
+class UnknownDictionary(ValueError):
+    """A row was compressed with a dictionary this codec has not loaded."""
+
+    def __init__(self, dict_id: int):
+        super().__init__(f"Job cache row needs unknown zstd dictionary {dict_id}")
+        self.dict_id = dict_id
+
+
+def split_description(job: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+    """The job without job_info.description (the "header"), and the description."""
+    job_info = job.get("job_info")
+    if not isinstance(job_info, dict) or "description" not in job_info:
+        return job, ""
+    header_info = {k: v for k, v in job_info.items() if k != "description"}
+    return {**job, "job_info": header_info}, job_info.get("description") or ""
+
+
+class JobCodec:
+    """Row format for the job cache.
+
+    zstd rows are  b"Z" | header length | zstd(msgpack(header)) | zstd(description),
+    both frames compressed with the active trained dictionary, so decode_header()
+    can read titles and company names without touching the description.
+    Only a non-empty string description gets its own frame; a missing, empty
+    or None one stays in the header as it was, so decode(encode(job)) == job.
+    Rows that start with "{" are plain JSON and stay readable forever.
+    """
+
+    def __init__(self, name: str = JOB_CACHE_CODEC, level: int = JOB_CODEC_LEVEL):
+        self.name = name
+        self.level = level
+        self.dict_id = 0
+        self._dictionaries: Dict[int, Any] = {}
+        self._compressor = None
+        self._decompressors: Dict[int, Any] = {}
+
+    # --- Dictionaries ---
+    def add_dictionary(self, data: bytes, active: bool = True) -> int:
+        import zstandard as zstd
+        dictionary = zstd.ZstdCompressionDict(data)
+        dict_id = dictionary.dict_id()
+        self._dictionaries[dict_id] = dictionary
+        if active:
+            self.dict_id = dict_id
+            self._compressor = None
+        return dict_id
+
+    def has_dictionary(self, dict_id: int) -> bool:
+        return dict_id in self._dictionaries
+
+    @staticmethod
+    def train_dictionary(jobs: List[Dict[str, Any]], size: int = JOB_DICT_SIZE) -> bytes:
+        """Dictionary trained on headers and descriptions, i.e. the recurring LinkedIn boilerplate."""
+        import ormsgpack
+        import zstandard as zstd
+        samples = []
+        for job in jobs:
+            header, description = split_description(job)
+            samples.append(ormsgpack.packb(header))
+            if description:
+                samples.append(description.encode("utf-8"))
+        return zstd.train_dictionary(size, samples).as_bytes()
+
+    def _get_compressor(self):
+        if self._compressor is None:
+            import zstandard as zstd
+            dictionary = self._dictionaries.get(self.dict_id)
+            self._compressor = zstd.ZstdCompressor(level=self.level, dict_data=dictionary) if dictionary \
+                else zstd.ZstdCompressor(level=self.level)
+        return self._compressor
+
+    def _decompress(self, frame: bytes) -> bytes:
+        import zstandard as zstd
+        dict_id = zstd.get_frame_parameters(frame).dict_id
+        decompressor = self._decompressors.get(dict_id)
+        if decompressor is None:
+            if dict_id and dict_id not in self._dictionaries:
+                raise UnknownDictionary(dict_id)
+            decompressor = zstd.ZstdDecompressor(dict_data=self._dictionaries[dict_id]) if dict_id \
+                else zstd.ZstdDecompressor()
+            self._decompressors[dict_id] = decompressor
+        return decompressor.decompress(frame)
+
+    # --- Rows ---
+    def encode(self, job: Dict[str, Any]) -> bytes:
+        if self.name == "json":
+            return json.dumps(job, separators=(",", ":")).encode("utf-8")
+        import ormsgpack
+        job_info = job.get("job_info")
+        description = job_info.get("description") if isinstance(job_info, dict) else None
+        if isinstance(description, str) and description:
+            header, _ = split_description(job)
+        else:
+            header, description = job, ""
+        compressor = self._get_compressor()
+        header_frame = compressor.compress(ormsgpack.packb(header))
+        body_frame = compressor.compress(description.encode("utf-8")) if description else b""
+        return ZSTD_TAG + _HEADER_LEN.pack(len(header_frame)) + header_frame + body_frame
+
+    def _frames(self, data: bytes) -> Tuple[bytes, bytes]:
+        (header_len,) = _HEADER_LEN.unpack_from(data, 1)
+        start = 1 + _HEADER_LEN.size
+        return data[start:start + header_len], data[start + header_len:]
+
+    def decode_header(self, data: bytes) -> Dict[str, Any]:
+        """Everything except job_info.description; the description frame is never decompressed."""
+        if data[:1] != ZSTD_TAG:
+            header, _ = split_description(json.loads(data))
+            return header
+        import ormsgpack
+        header_frame, _ = self._frames(data)
+        header, _ = split_description(ormsgpack.unpackb(self._decompress(header_frame)))
+        return header
+
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        if data[:1] != ZSTD_TAG:
+            return json.loads(data)
+        import ormsgpack
+        header_frame, body_frame = self._frames(data)
+        job = ormsgpack.unpackb(self._decompress(header_frame))
+        if body_frame:
+            job["job_info"]["description"] = self._decompress(body_frame).decode("utf-8")
+        return job
@@ -0,0 +1,278 @@
+import os
+import math
+import zlib
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from filelock import FileLock
+from Logic.prefilter import extract_terms
+
+# --- Index settings ---
+JOB_INDEX_DIM = int(os.getenv("JOB_INDEX_DIM", "1024"))
+JOB_INDEX_INITIAL_ROWS = 1024
+TITLE_WEIGHT = 2.0
+
+
+def hashed_vector(text: str, title: str = "", dim: int = JOB_INDEX_DIM) -> np.ndarray:
+    """L2-normalized signed feature-hashing vector of the text's unigrams and bigrams.
+
+    Every term lands in one of `dim` buckets with a +/-1 sign taken from its
+    hash, so collisions mostly cancel out instead of inflating similarity.
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    for terms, weight in ((extract_terms(text), 1.0), (extract_terms(title), TITLE_WEIGHT)):
+        for term, count in Counter(terms).items():
+            h = zlib.crc32(term.encode("utf-8"))
+            sign = 1.0 if h & 0x80000000 else -1.0
+            vector[h % dim] += sign * weight * (1.0 + math.log(count))
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def job_vector(job: Dict[str, Any], dim: int = JOB_INDEX_DIM) -> np.ndarray:
+    info = job.get("job_info", {})
+    return hashed_vector(info.get("description", ""), info.get("title", ""), dim)
+
+
+class JobIndex:
+    """Cosine-similarity index over cached jobs, kept in a memory-mapped file.
+
+    Row i of job_index.f32 is the vector of the i-th ID line in job_index.ids.
+    A "-<id>" line removes that job (its row is zeroed), and a bare "-" is a
+    dead row. Both files only grow, so updates never rewrite the index.
+
+    Several processes (app.py, api.py, rank_jobs.py) may share one index:
+    writes hold job_index.lock and first read any lines other processes
+    appended, so every row number is taken from the file, not local state.
+    """
+
+    def __init__(self, cache_dir: str = "data", dim: int = JOB_INDEX_DIM):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.dim = dim
+        self.row_bytes = dim * 4
+        self.vectors_path = os.path.join(cache_dir, "job_index.f32")
+        self.ids_path = os.path.join(cache_dir, "job_index.ids")
+        self._lock = threading.Lock()
+        self._file_lock = FileLock(os.path.join(cache_dir, "job_index.lock"))
+        self.ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._offset = 0  # bytes of job_index.ids already applied
+        self._vectors: Optional[np.memmap] = None
+
+        with self._file_lock:
+            self._check_header()
+            self._refresh_ids()
+            stored_rows = self._stored_rows()
+            if stored_rows < len(self.ids):
+                # Interrupted write: drop IDs whose vector never made it to disk
+                self.ids = self.ids[:stored_rows]
+                self._rows = {job_id: row for job_id, row in self._rows.items() if row < stored_rows}
+                self._write_ids()
+            self._grow_file(JOB_INDEX_INITIAL_ROWS)
+            self._map()
+
+    # --- Files ---
+    def _stored_rows(self) -> int:
+        return os.path.getsize(self.vectors_path) // self.row_bytes if os.path.exists(self.vectors_path) else 0
+
+    def _check_header(self):
+        if not os.path.exists(self.ids_path):
+            self._write_ids()
+            return
+        with open(self.ids_path, "r", encoding="utf-8") as f:
+            header = f.readline().rstrip("\n")
+        if header != f"# dim={self.dim}":
+            # Written with another dimension: start over rather than mix vectors
+            if os.path.exists(self.vectors_path):
+                os.remove(self.vectors_path)
+            self._write_ids()
+
+    def _refresh_ids(self):
+        """Apply lines appended since the last read (by this or another process)."""
+        if os.path.getsize(self.ids_path) <= self._offset:
+            return
+        with open(self.ids_path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1  # a line still being written is read next time
+        lines = data[:end].decode("utf-8").splitlines()
+        if self._offset == 0:
+            lines = lines[1:]  # header
+        for line in lines:
+            self._apply(line)
+        self._offset += end
+
+    def _apply(self, line: str):
+        if line == "-":
+            self.ids.append("")
+        elif line.startswith("-"):
+            self._rows.pop(line[1:], None)
+        elif line:
+            self._rows[line] = len(self.ids)
+            self.ids.append(line)
+
+    def _write_ids(self):
+        lines = [job_id if self._rows.get(job_id) == row else "-" for row, job_id in enumerate(self.ids)]
+        with open(self.ids_path, "w", encoding="utf-8") as f:
+            f.write("\n".join([f"# dim={self.dim}", *lines]) + "\n")
+        self._offset = os.path.getsize(self.ids_path)
+
+    def _append_ids(self, lines: List[str]):
+        with open(self.ids_path, "a", encoding="utf-8") as f:
+            f.write("".join(line + "\n" for line in lines))
+        self._offset = os.path.getsize(self.ids_path)
+
+    def _grow_file(self, rows: int):
+        """Make room for `rows` vectors, doubling; the caller holds the file lock."""
+        stored = self._stored_rows()
+        if rows <= stored:
+            return
+        capacity = max(stored, JOB_INDEX_INITIAL_ROWS)
+        while capacity < rows:
+            capacity *= 2
+        with open(self.vectors_path, "ab") as f:
+            f.truncate(capacity * self.row_bytes)
+
+    def _map(self):
+        """Map the vectors file again if it grew, here or in another process."""
+        rows = self._stored_rows()
+        if self._vectors is not None:
+            if self._vectors.shape[0] >= rows:
+                return
+            self._vectors.flush()
+        self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r+", shape=(rows, self.dim))
+
+    def _refresh(self):
+        self._refresh_ids()
+        self._map()
+
+    # --- Updates ---
+    def add(self, job_id: str, job: Dict[str, Any]):
+        vector = job_vector(job, self.dim)
+        job_id = str(job_id)
+        with self._lock, self._file_lock:
+            self._refresh_ids()
+            row = self._rows.get(job_id)
+            if row is None:
+                self._grow_file(len(self.ids) + 1)
+            self._map()
+            if row is not None:
+                self._vectors[row] = vector
+                return
+            row = len(self.ids)
+            # Vector first: a reader that sees the ID line always finds its vector
+            self._vectors[row] = vector
+            self._vectors.flush()
+            self._append_ids([job_id])
+            self._apply(job_id)
+
+    def remove(self, job_ids: List[str]):
+        """Drop jobs from query results, e.g. after the job cache evicted them."""
+        with self._lock, self._file_lock:
+            self._refresh()
+            removed = [job_id for job_id in dict.fromkeys(map(str, job_ids)) if job_id in self._rows]
+            if not removed:
+                return
+            for job_id in removed:
+                self._vectors[self._rows[job_id]] = 0
+            self._vectors.flush()
+            self._append_ids([f"-{job_id}" for job_id in removed])
+            for job_id in removed:
+                self._apply(f"-{job_id}")
+
+    def sync(self, cache) -> int:
+        """Index cached jobs that predate the index; returns how many were added."""
+        added = 0
+        for job_id in dict.fromkeys(cache.job_ids() + cache.legacy_job_ids()):
+            if job_id not in self._rows:
+                job = cache.get(job_id)
+                if job is not None:
+                    self.add(job_id, job)
+                    added += 1
+        return added
+
+    # --- Queries ---
+    def query(self, vector: np.ndarray, k: int = 10, exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Top-k (job_id, cosine similarity) pairs, best first."""
+        with self._lock:
+            # Reads only take complete ID lines, whose vectors are already on disk
+            self._refresh()
+        count = len(self.ids)
+        if not count or k <= 0:
+            return []
+        scores = self._vectors[:count] @ vector
+        if exclude in self._rows:
+            scores[self._rows[exclude]] = -np.inf
+        k = min(k, count)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[i], float(scores[i])) for i in top if scores[i] > 0]
+
+    def similar_to_job(self, job_id: str, k: int = 10) -> List[Tuple[str, float]]:
+        with self._lock:
+            self._refresh()
+        row = self._rows.get(str(job_id))
+        if row is None:
+            return []
+        return self.query(np.array(self._vectors[row]), k, exclude=str(job_id))
+
+    def matching_text(self, text: str, k: int = 10) -> List[Tuple[str, float]]:
+        return self.query(hashed_vector(text, dim=self.dim), k)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def close(self):
+        self._vectors.flush()
+
+
+_indexes: Dict[str, JobIndex] = {}
+_synced: set = set()
+
+def get_job_index(cache_dir: str = "data") -> JobIndex:
+    if cache_dir not in _indexes:
+        _indexes[cache_dir] = JobIndex(cache_dir)
+    return _indexes[cache_dir]
+
+
+def _synced_index(cache_dir: str) -> JobIndex:
+    from Logic.job_cache import get_job_cache
+    index = get_job_index(cache_dir)
+    # New jobs are indexed by JobCache.put; only older entries need a one-off pass
+    if cache_dir not in _synced:
+        index.sync(get_job_cache(cache_dir))
+        _synced.add(cache_dir)
+    return index
+
+
+def _fresh_hits(search, k: int, cache_dir: str) -> List[Tuple[str, float]]:
+    """Top-k hits that are still fresh in the job cache, so callers never go back to Apify.
+
+    Rows of expired or evicted jobs are dropped from the index on the way.
+    """
+    from Logic.job_cache import get_job_cache
+    cache = get_job_cache(cache_dir)
+    wanted = k * 2
+    while True:
+        hits = search(wanted)
+        fresh = {job_id for job_id, _ in hits if cache.contains(job_id)}
+        if len(fresh) >= k or len(hits) < wanted:
+            break
+        wanted *= 4
+    stale = [job_id for job_id, _ in hits if job_id not in fresh]
+    if stale:
+        get_job_index(cache_dir).remove(stale)
+    return [(job_id, score) for job_id, score in hits if job_id in fresh][:k]
+
+
+def similar_jobs(job_id: str, k: int = 10, cache_dir: str = "data") -> List[Tuple[str, float]]:
+    """Cached jobs most similar to an already cached job."""
+    index = _synced_index(cache_dir)
+    return _fresh_hits(lambda n: index.similar_to_job(job_id, n), k, cache_dir)
+
+
+def jobs_matching_cv(cv_text: str, k: int = 10, cache_dir: str = "data") -> List[Tuple[str, float]]:
+    """Cached jobs whose description best matches a CV (or profile text)."""
+    index = _synced_index(cache_dir)
+    return _fresh_hits(lambda n: index.matching_text(cv_text, n), k, cache_dir)
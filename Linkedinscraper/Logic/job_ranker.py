@@ -0,0 +1,179 @@
+import os
+import csv
+import json
+import asyncio
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+from agents.jobextractor import job_id_of
+from Logic.job_cache import get_or_cache_jobs
+from Logic.dedup import analysis_reuse
+from Logic.job_analysis import analyze_batch, chunked, ANALYSIS_CONCURRENCY, ANALYSIS_BATCH_SIZE
+
+# How many IDs are looked up in the job cache per round-trip
+RANK_FETCH_CHUNK = int(os.getenv("RANK_FETCH_CHUNK", "50"))
+
+RESULT_FIELDS = ["job_id", "title", "company", "score", "summary", "required_skills", "cv_recommendations", "link", "prescore", "tier"]
+
+
+def read_job_ids(lines: Iterable[str]) -> List[str]:
+    """One job ID per line; blank lines and # comments are ignored, duplicates dropped."""
+    job_ids = []
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if line:
+            job_ids.append(line)
+    return list(dict.fromkeys(job_ids))
+
+
+# --- Result sinks: append-only, so a crashed run can be resumed ---
+class JsonlSink:
+    def __init__(self, path: str):
+        self.path = path
+
+    def scored_ids(self) -> Set[str]:
+        if not os.path.exists(self.path):
+            return set()
+        scored = set()
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    scored.add(str(json.loads(line)["job_id"]))
+                except (ValueError, KeyError):
+                    continue  # torn last line from a crash
+        return scored
+
+    def __enter__(self):
+        self._file = open(self.path, "a", encoding="utf-8")
+        return self
+
+    def write(self, result: Dict[str, Any]):
+        self._file.write(json.dumps(result, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def __exit__(self, *exc):
+        self._file.close()
+
+
+class CsvSink:
+    def __init__(self, path: str):
+        self.path = path
+
+    def scored_ids(self) -> Set[str]:
+        if not os.path.exists(self.path):
+            return set()
+        with open(self.path, "r", encoding="utf-8", newline="") as f:
+            return {row["job_id"] for row in csv.DictReader(f) if row.get("job_id")}
+
+    def __enter__(self):
+        is_new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self._file = open(self.path, "a", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=RESULT_FIELDS, extrasaction="ignore")
+        if is_new:
+            self._writer.writeheader()
+        return self
+
+    def write(self, result: Dict[str, Any]):
+        row = {key: result.get(key) for key in RESULT_FIELDS}
+        for key in ("required_skills", "cv_recommendations"):
+            if isinstance(row[key], list):
+                row[key] = "; ".join(row[key])
+        self._writer.writerow(row)
+        self._file.flush()
+
+    def __exit__(self, *exc):
+        self._file.close()
+
+
+def open_sink(path: str):
+    return CsvSink(path) if path.endswith(".csv") else JsonlSink(path)
+
+
+# --- Ranking pipeline ---
+async def rank_jobs(job_ids: List[str], user_cv: str, concurrency: int = ANALYSIS_CONCURRENCY,
+                    top_k: Optional[int] = None, min_prescore: Optional[float] = None,
+                    batch_size: int = ANALYSIS_BATCH_SIZE,
+                    skip: Optional[Set[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Yield one result dict per job as soon as its analysis finishes.
+
+    Jobs that could not be fetched or analysed are yielded with an "error" key.
+    With top_k or min_prescore set, all jobs are fetched first and only those
+    passing the local BM25 pre-filter are sent to the LLM. IDs in `skip` are
+    never analysed, but still count towards the pre-filter, so a resumed run
+    shortlists the same jobs as the first one.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    use_prefilter = top_k is not None or min_prescore is not None
+    skip = skip or set()
+
+    async def analyze_jobs(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        results = await analyze_batch(jobs, user_cv, semaphore)
+        return [
+            {"job_id": job_id_of(job), "error": str(result)} if isinstance(result, Exception) else result
+            for job, result in zip(jobs, results)
+        ]
+
+    def start(jobs: List[Dict[str, Any]]):
+        for batch in chunked(jobs, batch_size):
+            pending.add(asyncio.create_task(analyze_jobs(batch)))
+
+    pending: Set[asyncio.Task] = set()
+    fetched: Dict[str, Dict[str, Any]] = {}
+    for offset in range(0, len(job_ids), RANK_FETCH_CHUNK):
+        chunk = job_ids[offset:offset + RANK_FETCH_CHUNK]
+        if not use_prefilter:
+            chunk = [job_id for job_id in chunk if job_id not in skip]
+        found = []
+        for job_id, job in (await get_or_cache_jobs(chunk)).items():
+            if job is None:
+                if job_id in skip:
+                    continue
+                yield {"job_id": job_id, "error": "could not fetch job details"}
+            elif use_prefilter:
+                fetched[job_id] = job
+            else:
+                found.append(job)
+        start(found)
+
+        # Drain whatever has finished before fetching the next chunk
+        done = {task for task in pending if task.done()}
+        pending -= done
+        for task in done:
+            for result in task.result():
+                yield result
+
+    if use_prefilter:
+        from Logic.prefilter import prefilter_jobs  # numpy is only needed here
+        shortlisted = prefilter_jobs(list(fetched.values()), user_cv, top_k=top_k, min_score=min_prescore)
+        todo = [job for job in shortlisted if job_id_of(job) not in skip]
+        print(f" Pre-filter kept {len(shortlisted)} of {len(fetched)} jobs; {len(todo)} still need LLM analysis.")
+        start(todo)
+
+    for next_done in asyncio.as_completed(pending):
+        for result in await next_done:
+            yield result
+
+
+async def rank_to_file(job_ids: List[str], user_cv: str, output_path: str, concurrency: int = ANALYSIS_CONCURRENCY,
+                       top_k: Optional[int] = None, min_prescore: Optional[float] = None,
+                       batch_size: int = ANALYSIS_BATCH_SIZE) -> List[Dict[str, Any]]:
+    """Score jobs into output_path, skipping IDs it already holds; returns results sorted by score."""
+    sink = open_sink(output_path)
+    already_scored = sink.scored_ids()
+    todo = [job_id for job_id in job_ids if job_id not in already_scored]
+    if already_scored:
+        print(f" Resuming: {len(job_ids) - len(todo)} of {len(job_ids)} jobs already scored.")
+
+    scored = []
+    with sink:
+        # The full list goes in, so the pre-filter shortlist is the same on every resume
+        async for result in rank_jobs(job_ids, user_cv, concurrency=concurrency, top_k=top_k,
+                                      min_prescore=min_prescore, batch_size=batch_size, skip=already_scored):
+            if "error" in result:
+                print(f" ****** Skipping job {result['job_id']}: {result['error']}")
+                continue
+            sink.write(result)
+            scored.append(result)
+            print(f" [{len(scored)}/{len(todo)}] {result['score']:>3}  {result['title']} at {result['company']}")
+
+    if analysis_reuse.saved_calls:
+        print(f" Reposted jobs reused an existing analysis {analysis_reuse.saved_calls} times (LLM calls saved).")
+    return sorted(scored, key=lambda r: r["score"], reverse=True)
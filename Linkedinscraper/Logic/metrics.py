@@ -0,0 +1,199 @@
+import os
+import time
+import threading
+import functools
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Optional, Tuple
+
+try:
+    from opentelemetry import trace
+    _tracer = trace.get_tracer("linkedin-job-analyser")
+except ImportError:  # spans are optional; metrics still work
+    _tracer = None
+
+# METRICS_ENABLED=0 turns every helper below into a near-free no-op
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1").lower() not in ("0", "false", "off")
+
+# Histogram buckets in seconds, from cache hits to long LLM calls
+DURATION_BUCKETS = (0.005, 0.025, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    """Counters and duration histograms, rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, list]] = {}
+        self._help: Dict[str, Tuple[str, str]] = {}
+
+    @staticmethod
+    def _key(labels: Dict[str, str]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name: str, value: float = 1.0, help: str = "", **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._help.setdefault(name, ("counter", help))
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, help: str = "", **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._help.setdefault(name, ("histogram", help))
+            series = self._histograms.setdefault(name, {})
+            # [bucket counts..., count, sum]
+            state = series.setdefault(key, [0] * len(DURATION_BUCKETS) + [0, 0.0])
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += 1
+            state[-1] += value
+
+    def counter_value(self, name: str, **labels) -> float:
+        return self._counters.get(name, {}).get(self._key(labels), 0.0)
+
+    def render(self) -> str:
+        def fmt(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+            pairs = list(key) + ([extra] if extra else [])
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                kind, help = self._help[name]
+                lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+                lines += [f"{name}{fmt(key)} {value}" for key, value in series.items()]
+            for name, series in sorted(self._histograms.items()):
+                kind, help = self._help[name]
+                lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+                for key, state in series.items():
+                    for bound, count in zip(DURATION_BUCKETS, state):
+                        lines.append(f"{name}_bucket{fmt(key, ('le', str(bound)))} {count}")
+                    lines.append(f"{name}_bucket{fmt(key, ('le', '+Inf'))} {state[-2]}")
+                    lines.append(f"{name}_count{fmt(key)} {state[-2]}")
+                    lines.append(f"{name}_sum{fmt(key)} {state[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+# --- Recording helpers used across the app ---
+@contextmanager
+def _span(stage: str, attributes: Dict[str, object], attach: bool):
+    if _tracer is None:
+        otel_span = nullcontext()
+    elif attach:
+        otel_span = _tracer.start_as_current_span(stage, attributes=attributes)
+    else:
+        # Not made current: safe to hold open across yields of an async generator
+        otel_span = _tracer.start_span(stage, attributes=attributes)
+    start = time.perf_counter()
+    status = "ok"
+    with otel_span as active:
+        try:
+            yield active
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            registry.observe("stage_duration_seconds", time.perf_counter() - start,
+                             help="Wall time per pipeline stage", stage=stage, status=status)
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(stage: str, attach: bool = True, **attributes):
+    """Time a block as one pipeline stage and mirror it as an OpenTelemetry span.
+
+    Pass attach=False when the block spans yields of an async generator.
+    """
+    if not METRICS_ENABLED:
+        return _NOOP_SPAN
+    return _span(stage, attributes, attach)
+
+
+def timed(stage: str):
+    """Decorator form of span() for async functions such as LangGraph nodes."""
+    def decorate(fn):
+        if not METRICS_ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with span(stage):
+                return await fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def record_cache(cache: str, hit: bool, count: int = 1):
+    if METRICS_ENABLED and count:
+        registry.inc("cache_requests_total", count, help="Cache lookups by outcome",
+                     cache=cache, result="hit" if hit else "miss")
+
+
+def record_retry(stage: str):
+    if METRICS_ENABLED:
+        registry.inc("retries_total", help="Retried calls per stage", stage=stage)
+
+
+def record_cascade(tier: str, count: int = 1):
+    if METRICS_ENABLED and count:
+        registry.inc("cascade_jobs_total", count, help="Jobs finished per analysis cascade tier", tier=tier)
+
+
+def record_usage(agent: str, usage):
+    """Token counts from a pydantic-ai Usage object (request_tokens / response_tokens)."""
+    if not METRICS_ENABLED or usage is None:
+        return
+    registry.inc("llm_requests_total", getattr(usage, "requests", 1) or 1, help="LLM requests sent", agent=agent)
+    registry.inc("llm_input_tokens_total", getattr(usage, "request_tokens", 0) or 0,
+                 help="Prompt tokens reported by the model", agent=agent)
+    registry.inc("llm_output_tokens_total", getattr(usage, "response_tokens", 0) or 0,
+                 help="Completion tokens reported by the model", agent=agent)
+
+
+def cache_hit_ratio(cache: str) -> float:
+    hits = registry.counter_value("cache_requests_total", cache=cache, result="hit")
+    misses = registry.counter_value("cache_requests_total", cache=cache, result="miss")
+    return hits / (hits + misses) if hits + misses else 0.0
+
+
+# --- Prometheus scrape endpoint ---
+def start_metrics_server(port: int, host: str = "0.0.0.0"):
+    """Serve registry.render() at /metrics from a daemon thread."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,132 @@
+import os
+import atexit
+import asyncio
+import hashlib
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+from Logic.metrics import span, record_cache
+
+# --- Extraction settings ---
+PDF_CACHE_ENTRIES = int(os.getenv("PDF_CACHE_ENTRIES", "256"))
+PDF_PARALLEL_PAGES = int(os.getenv("PDF_PARALLEL_PAGES", "8"))   # split documents longer than this
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+
+# PyMuPDF is not thread-safe; extraction in this process (small PDFs) takes turns
+_fitz_lock = threading.Lock()
+
+
+def _locked(func, *args):
+    with _fitz_lock:
+        return func(*args)
+
+
+def _page_count(data: bytes) -> int:
+    import fitz
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        return doc.page_count
+
+
+def _extract_pages(data: bytes, start: int, stop: int) -> str:
+    # Each worker opens its own document: PyMuPDF objects are not shareable across threads/processes
+    import fitz
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        return "\n".join(doc[i].get_text() for i in range(start, min(stop, doc.page_count)))
+
+
+class PdfTextExtractor:
+    """Extracts PDF text off the event loop, memoized by content hash."""
+
+    def __init__(self, cache_entries: int = PDF_CACHE_ENTRIES, parallel_pages: int = PDF_PARALLEL_PAGES,
+                 workers: int = PDF_WORKERS):
+        self.cache_entries = cache_entries
+        self.parallel_pages = parallel_pages
+        self.workers = workers
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # Gradio and uvicorn run threads; forking a threaded process can copy held locks,
+                # so workers are spawned fresh (re-importing __main__, so entry points keep their
+                # startup under `if __name__ == "__main__"`), and the pool is shut down at exit
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor):
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _extract(self, data: bytes) -> str:
+        page_count = await asyncio.to_thread(_locked, _page_count, data)
+        if page_count <= self.parallel_pages:
+            return await asyncio.to_thread(_locked, _extract_pages, data, 0, page_count)
+
+        # Long documents: page ranges in parallel worker processes, joined in page order
+        loop = asyncio.get_running_loop()
+        step = -(-page_count // self.workers)
+        for _ in range(2):
+            pool = self._get_pool()
+            try:
+                parts: List[str] = await asyncio.gather(*(
+                    loop.run_in_executor(pool, _extract_pages, data, start, start + step)
+                    for start in range(0, page_count, step)
+                ))
+                return "\n".join(parts)
+            except BrokenProcessPool as e:
+                # A dead worker breaks the whole pool; the next call gets a new one
+                print(f" ****** Error in the PDF worker pool, restarting it: {e}")
+                self._discard_pool(pool)
+        return await asyncio.to_thread(_locked, _extract_pages, data, 0, page_count)
+
+    async def extract_bytes(self, data: bytes) -> str:
+        key = hashlib.sha256(data).hexdigest()
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            record_cache("pdf_text", hit=True)
+            return self._cache[key]
+        record_cache("pdf_text", hit=False)
+
+        with span("pdf_extract", bytes=len(data)):
+            text = await self._extract(data)
+        self._cache[key] = text
+        while len(self._cache) > self.cache_entries:
+            self._cache.popitem(last=False)
+        return text
+
+    async def extract_file(self, path: str) -> str:
+        def read():
+            with open(path, "rb") as f:
+                return f.read()
+        return await self.extract_bytes(await asyncio.to_thread(read))
+
+    def close(self):
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+
+pdf_extractor = PdfTextExtractor()
+
+
+async def extract_pdf_text(path: str) -> str:
+    return await pdf_extractor.extract_file(path)
+
+
+async def load_cv_text(path: str) -> str:
+    """CV text from a PDF or a plain-text file."""
+    if path.lower().endswith(".pdf"):
+        return await extract_pdf_text(path)
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
@@ -0,0 +1,99 @@
+import os
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Union
+from agents.jobextractor import stream_jobs, job_id_of, FETCH_MAX_BATCH
+from Logic.job_analysis import analyze_batch, ANALYSIS_CONCURRENCY, ANALYSIS_BATCH_SIZE
+
+# Fetched jobs waiting for an analysis worker; the fetcher blocks when this is full
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "50"))
+
+_DONE = object()
+
+
+async def fetch_and_analyze(job_ids: List[str], user_cv: str, concurrency: int = ANALYSIS_CONCURRENCY,
+                            batch_size: int = ANALYSIS_BATCH_SIZE,
+                            queue_size: int = PIPELINE_QUEUE_SIZE) -> AsyncIterator[Dict[str, Any]]:
+    """Analyze jobs while they are still being fetched, yielding results as they finish.
+
+    Each yielded dict is either an analysis result or {"job_id", "error"}.
+    Jobs the fetcher never returned are reported as errors at the end.
+    Actor runs are started one FETCH_MAX_BATCH chunk at a time, and only
+    while the queue has room for them, so a slow analysis stage holds the
+    fetcher back instead of piling up finished runs.
+    """
+    jobs_in: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    results_out: asyncio.Queue = asyncio.Queue()
+    semaphore = asyncio.Semaphore(concurrency)
+    fetched: Dict[str, Dict[str, Any]] = {}
+
+    unique_ids = list(dict.fromkeys(str(job_id) for job_id in job_ids))
+    # Chunks being fetched at once; a chunk only finishes once the queue took all its jobs
+    chunks_ahead = asyncio.Semaphore(max(1, queue_size // FETCH_MAX_BATCH))
+
+    async def fetch_chunk(chunk: List[str]):
+        try:
+            async for job in stream_jobs(chunk):
+                fetched[job_id_of(job)] = job
+                await jobs_in.put(job)
+        finally:
+            chunks_ahead.release()
+
+    async def produce():
+        chunks: List[asyncio.Task] = []
+        try:
+            for start in range(0, len(unique_ids), FETCH_MAX_BATCH):
+                await chunks_ahead.acquire()
+                chunks.append(asyncio.create_task(fetch_chunk(unique_ids[start:start + FETCH_MAX_BATCH])))
+            await asyncio.gather(*chunks)
+        finally:
+            for chunk in chunks:
+                chunk.cancel()
+            for _ in range(concurrency):
+                await jobs_in.put(_DONE)
+
+    async def work():
+        try:
+            while True:
+                job = await jobs_in.get()
+                if job is _DONE:
+                    break
+                # Take whatever else is already queued, up to one packed batch
+                batch = [job]
+                while len(batch) < batch_size and not jobs_in.empty():
+                    extra = jobs_in.get_nowait()
+                    if extra is _DONE:
+                        await jobs_in.put(_DONE)
+                        break
+                    batch.append(extra)
+
+                try:
+                    results: List[Union[Dict[str, Any], Exception]] = await analyze_batch(batch, user_cv, semaphore)
+                except Exception as e:
+                    print(f" ****** Error analyzing batch: {e}")
+                    results = [e] * len(batch)
+                for job, result in zip(batch, results):
+                    if isinstance(result, Exception):
+                        result = {"job_id": job_id_of(job), "error": str(result)}
+                    await results_out.put(result)
+        finally:
+            # Always signal, or the consumer below would wait forever
+            results_out.put_nowait(_DONE)
+
+    producer = asyncio.create_task(produce())
+    workers = [asyncio.create_task(work()) for _ in range(concurrency)]
+    try:
+        finished = 0
+        while finished < len(workers):
+            result = await results_out.get()
+            if result is _DONE:
+                finished += 1
+            else:
+                yield result
+        await producer
+    finally:
+        for task in [producer, *workers]:
+            task.cancel()
+
+    for job_id in unique_ids:
+        if job_id not in fetched:
+            yield {"job_id": job_id, "error": "could not fetch job details"}
@@ -0,0 +1,71 @@
+import re
+from typing import Any, Dict, List, Optional
+import numpy as np
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Keeps tech tokens such as c++, c#, node.js, ci/cd intact
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]|[a-z0-9]")
+
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could did do does
+doing for from had has have having he her here him his how i if in into is it its job just me more
+most my no not of on once only or other our out over own role same she should so some such than that
+the their them then there these they this those through to too under until up very via was we well
+were what when where which while who will with within work would you your years year experience
+team teams strong ability including etc using use new across help based must plus preferred required
+""".split())
+
+
+def extract_terms(text: str) -> List[str]:
+    """Lowercased unigram and bigram terms, stopwords removed."""
+    tokens = [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS and len(t) > 1]
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+def job_text_of(job: Dict[str, Any]) -> str:
+    return f"{job['job_info'].get('title', '')}\n{job['job_info'].get('description', '')}"
+
+
+def bm25_scores(query_text: str, documents: List[str]) -> np.ndarray:
+    """BM25 score of every document against the query terms, computed in one pass."""
+    vocab = {term: i for i, term in enumerate(dict.fromkeys(extract_terms(query_text)))}
+    if not vocab or not documents:
+        return np.zeros(len(documents))
+
+    # Term-frequency matrix restricted to query terms (documents x vocab)
+    tf = np.zeros((len(documents), len(vocab)), dtype=np.float32)
+    doc_len = np.zeros(len(documents), dtype=np.float32)
+    for row, doc in enumerate(documents):
+        terms = extract_terms(doc)
+        doc_len[row] = len(terms)
+        cols = [vocab[t] for t in terms if t in vocab]
+        if cols:
+            np.add.at(tf[row], cols, 1.0)
+
+    df = np.count_nonzero(tf, axis=0)
+    n_docs = len(documents)
+    idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+
+    avg_len = doc_len.mean() or 1.0
+    norm = BM25_K1 * (1.0 - BM25_B + BM25_B * doc_len / avg_len)
+    weights = tf * (BM25_K1 + 1.0) / (tf + norm[:, None])
+    return weights @ idf
+
+
+def prefilter_jobs(jobs: List[Dict[str, Any]], user_cv: str,
+                   top_k: Optional[int] = None, min_score: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Attach a local "prescore" to each job and keep only the promising ones.
+
+    Returns copies of the kept jobs, best first. With neither limit set every
+    job is kept, so the scores can still be reported.
+    """
+    scores = bm25_scores(user_cv, [job_text_of(job) for job in jobs])
+    order = np.argsort(-scores, kind="stable")
+    if min_score is not None:
+        order = order[scores[order] >= min_score]
+    if top_k is not None:
+        order = order[:top_k]
+    return [{**jobs[i], "prescore": round(float(scores[i]), 3)} for i in order]
@@ -0,0 +1,97 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+DEFAULT_USER = "default"
+PROFILE_CACHE_ENTRIES = int(os.getenv("PROFILE_CACHE_ENTRIES", "10000"))
+
+
+def profile_to_text(profile: Dict[str, Any]) -> str:
+    return f"""Name: {profile['name']}
+University: {profile['university']}
+Degree: {profile['degree']}
+Courses: {profile['courses']}
+Experience: {', '.join(profile['experience']) if isinstance(profile['experience'], list) else profile['experience']}
+Skills: {profile['skills']}
+Projects: {', '.join(profile['projects']) if isinstance(profile['projects'], list) else profile['projects']}"""
+
+
+@dataclass(frozen=True)
+class StoredProfile:
+    profile: Dict[str, Any]
+    profile_text: str
+    version: int   # file mtime in ns; changes on every write
+
+
+class ProfileStore:
+    """User profiles on disk, cached in memory and refreshed when the file changes.
+
+    The default user keeps living in data/user_profile.json; everyone else
+    gets data/profiles/<user_id>.json.
+    """
+
+    def __init__(self, data_dir: str = "data", cache_entries: int = PROFILE_CACHE_ENTRIES):
+        self.data_dir = data_dir
+        self.cache_entries = cache_entries
+        self._cache: "OrderedDict[str, StoredProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def path_for(self, user_id: str) -> str:
+        if user_id == DEFAULT_USER:
+            return os.path.join(self.data_dir, "user_profile.json")
+        safe_id = "".join(c for c in user_id if c.isalnum() or c in "-_.@") or DEFAULT_USER
+        return os.path.join(self.data_dir, "profiles", f"{safe_id}.json")
+
+    def _remember(self, user_id: str, stored: StoredProfile):
+        with self._lock:
+            self._cache[user_id] = stored
+            self._cache.move_to_end(user_id)
+            while len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+
+    def get(self, user_id: str = DEFAULT_USER) -> Optional[StoredProfile]:
+        """Cached profile for user_id, or None if the user has not saved one."""
+        path = self.path_for(user_id)
+        try:
+            version = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            self._cache.pop(user_id, None)
+            return None
+
+        cached = self._cache.get(user_id)
+        if cached is not None and cached.version == version:
+            return cached
+
+        # Edited outside the app (or first read): reload and re-render once
+        with open(path, "r", encoding="utf-8") as f:
+            profile = json.load(f)
+        stored = StoredProfile(profile, profile_to_text(profile), version)
+        self._remember(user_id, stored)
+        return stored
+
+    def save(self, profile: Dict[str, Any], user_id: str = DEFAULT_USER) -> StoredProfile:
+        path = self.path_for(user_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to a temp file and rename, so readers never see half a profile
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(profile, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+        stored = StoredProfile(profile, profile_to_text(profile), os.stat(path).st_mtime_ns)
+        self._remember(user_id, stored)
+        return stored
+
+
+profile_store = ProfileStore()
+
+
+def user_id_of(request) -> str:
+    """Logged-in Gradio username when auth is enabled, otherwise the single default user."""
+    return getattr(request, "username", None) or DEFAULT_USER
@@ -0,0 +1,279 @@
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List
+from agents.jobextractor import job_id_of
+
+# --- Token budgets for the compacted inputs ---
+JOB_TOKEN_BUDGET = int(os.getenv("JOB_TOKEN_BUDGET", "1200"))
+COMPACT_CACHE_SIZE = int(os.getenv("COMPACT_CACHE_SIZE", "4096"))
+
+# Sentences matching these are dropped outright
+BOILERPLATE_RE = re.compile(
+    r"equal opportunity|equal employment|\beeo\b|without regard to|protected veteran|"
+    r"disability status|sexual orientation|gender identity|reasonable accommodation|"
+    r"e-?verify|background check|privacy (policy|notice)|applicant privacy|"
+    r"we (offer|provide) (a )?competitive|benefits (include|package)|health insurance|"
+    r"\bdental\b|401\(k\)|paid time off|\bpto\b|parental leave|wellness|"
+    r"follow us on|visit our (website|careers)|click apply",
+    re.IGNORECASE,
+)
+
+# Lines matching these (or under a header matching them) are kept first when truncating
+PRIORITY_RE = re.compile(
+    r"requirement|qualification|responsibilit|what you.ll do|what you will do|you will|"
+    r"must have|nice to have|skills|experience with|proficien|knowledge of|"
+    r"education|project|summary|profile|about the role",
+    re.IGNORECASE,
+)
+
+BULLET_RE = re.compile(r"^([-*•·▪◦‣]|\d{1,2}[.)])\s+")
+SENTENCE_END_RE = re.compile(r"(?<=[.!?;])\s+")
+
+
+@dataclass(frozen=True)
+class CompactText:
+    text: str
+    tokens_before: int
+    tokens_after: int
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly 4 characters per token for English text with the OpenAI tokenizers
+    return (len(text) + 3) // 4
+
+
+def _is_header(line: str) -> bool:
+    return len(line) < 60 and not BULLET_RE.match(line) and (
+        line.endswith(":") or line.startswith("#") or (line.isupper() and any(c.isalpha() for c in line)))
+
+
+def _blocks(text: str) -> List[List[str]]:
+    """Lines grouped into sections; a blank line or a header line starts a new block."""
+    lines = [re.sub(r"[ \t\u00a0]+", " ", line).strip() for line in text.splitlines()]
+
+    # PDF page headers/footers repeat on every page; keep only the first copy
+    seen, kept = set(), []
+    for line in lines:
+        key = line.lower()
+        if key and len(key) < 80 and key in seen:
+            continue
+        seen.add(key)
+        kept.append(line)
+
+    blocks, current = [], []
+    for line in kept:
+        if not line or _is_header(line):
+            if current:
+                blocks.append(current)
+            current = [line] if line else []
+        else:
+            current.append(line)
+    if current:
+        blocks.append(current)
+    return blocks
+
+
+def _strip_boilerplate(line: str) -> str:
+    # Single-newline text puts whole sections on one line, so filter sentence by sentence
+    if not BOILERPLATE_RE.search(line):
+        return line
+    return " ".join(s for s in SENTENCE_END_RE.split(line) if not BOILERPLATE_RE.search(s))
+
+
+def compact(text: str, token_budget: int) -> CompactText:
+    """Strip whitespace/boilerplate and fit the text into token_budget.
+
+    Boilerplate is dropped per sentence, and lines that look like requirements,
+    skills or experience (or sit under such a header) are kept before the rest;
+    the original order is preserved in the output. If nothing survives, the
+    raw text is hard-cut to the budget instead.
+    """
+    text = text or ""
+    tokens_before = estimate_tokens(text)
+
+    lines = []  # (block, line, text, priority)
+    for b, block in enumerate(_blocks(text)):
+        header = block[0] if _is_header(block[0]) else ""
+        body = [(n, _strip_boilerplate(line)) for n, line in enumerate(block) if line != header]
+        body = [(n, line) for n, line in body if line]
+        if header and not body and len(block) > 1:
+            continue  # a section that was all boilerplate
+        if header and not BOILERPLATE_RE.search(header):
+            body.insert(0, (0, header))
+        section_priority = bool(header and PRIORITY_RE.search(header))
+        lines += [(b, n, line, section_priority or bool(PRIORITY_RE.search(line))) for n, line in body]
+
+    ranked = sorted(range(len(lines)), key=lambda i: (not lines[i][3], i))
+    keep, used = set(), 0
+    for i in ranked:
+        cost = estimate_tokens(lines[i][2]) + 1
+        if used + cost > token_budget:
+            continue
+        keep.add(i)
+        used += cost
+
+    blocks: Dict[int, List[str]] = {}
+    for i in sorted(keep):
+        blocks.setdefault(lines[i][0], []).append(lines[i][2])
+    result = "\n\n".join("\n".join(block) for block in blocks.values())
+    if not result and text.strip():
+        # Everything was boilerplate or one huge line: fall back to a hard cut of the raw text
+        result = re.sub(r"[ \t\u00a0]+", " ", text).strip()[: token_budget * 4]
+    return CompactText(result, tokens_before, estimate_tokens(result))
+
+
+# Memoized on the raw text, so each posting/CV is compacted once per process
+compact_cached = lru_cache(maxsize=COMPACT_CACHE_SIZE)(compact)
+
+
+# --- Running totals, so callers can report what compaction saved ---
+compaction_stats = {"calls": 0, "tokens_before": 0, "tokens_after": 0}
+
+def _record(compacted: CompactText) -> str:
+    compaction_stats["calls"] += 1
+    compaction_stats["tokens_before"] += compacted.tokens_before
+    compaction_stats["tokens_after"] += compacted.tokens_after
+    return compacted.text
+
+
+def compact_job_description(job: Dict[str, Any]) -> CompactText:
+    return compact_cached(job["job_info"].get("description", ""), JOB_TOKEN_BUDGET)
+
+
+@lru_cache(maxsize=COMPACT_CACHE_SIZE)
+def compact_cv(cv_text: str) -> CompactText:
+    """Whitespace-normalized CV: blank runs collapsed and repeated lines dropped.
+
+    No boilerplate filter and no budget: a CV line mentioning "Delta Dental" or
+    "benefits" is experience, and generation needs the whole CV.
+    """
+    cv_text = cv_text or ""
+    lines: List[str] = []
+    for line in cv_text.splitlines():
+        line = re.sub(r"[ \t\u00a0]+", " ", line).strip()
+        if line and lines and line == lines[-1]:
+            continue  # e.g. a heading repeated across a PDF page break
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    text = "\n".join(lines).strip()
+    return CompactText(text, estimate_tokens(cv_text), estimate_tokens(text))
+
+
+# --- Shared prompt builders ---
+def job_text(job: Dict[str, Any]) -> str:
+    job_info = job["job_info"]
+    return f"""Job Title: {job_info['title']}
+Company: {job['company_info']['name']}
+Location: {job_info.get('location', 'N/A')}
+Description: {_record(compact_job_description(job))}"""
+
+
+def build_cv_analysis_prompt(job: Dict[str, Any], cv_text: str) -> str:
+    return f"""
+Analyze how well the following CV matches the provided job posting.
+
+=== Job Posting ===
+{job_text(job)}
+
+=== User CV ===
+{_record(compact_cv(cv_text))}
+
+Return your answer as a JSON object with:
+- summary
+- score (0–100)
+- required_skills
+- matched_skills
+- missing_skills
+- cv_recommendations
+"""
+
+
+def build_packed_analysis_prompt(jobs: List[Dict[str, Any]], cv_text: str) -> str:
+    postings = "\n\n".join(
+        f"--- Job ID: {job_id_of(job)} ---\n{job_text(job)}"
+        for job in jobs
+    )
+    return f"""
+Analyze how well the following CV matches each of the {len(jobs)} job postings below.
+
+=== Job Postings ===
+{postings}
+
+=== User CV ===
+{_record(compact_cv(cv_text))}
+
+Return a JSON list with exactly one object per job posting, in the same order, each with:
+- job_id (copied exactly from the "Job ID" header)
+- summary
+- score (0–100)
+- required_skills
+- matched_skills
+- missing_skills
+- cv_recommendations
+"""
+
+
+def build_score_prompt(jobs: List[Dict[str, Any]], cv_text: str) -> str:
+    postings = "\n\n".join(
+        f"--- Job ID: {job_id_of(job)} ---\n{job_text(job)}"
+        for job in jobs
+    )
+    return f"""
+Score how well the following CV matches each of the {len(jobs)} job postings below.
+
+=== Job Postings ===
+{postings}
+
+=== User CV ===
+{_record(compact_cv(cv_text))}
+
+Return a JSON list with exactly one object per job posting, in the same order, each with:
+- job_id (copied exactly from the "Job ID" header)
+- score (0–100)
+"""
+
+
+def build_profile_analysis_prompt(job: Dict[str, Any], profile_text: str) -> str:
+    return f"""
+Compare the following user profile with the job description.
+
+=== Job Description ===
+{job_text(job)}
+
+=== User Profile ===
+{profile_text}
+
+Return a JSON with:
+- score (0–100)
+- summary
+- matched_elements
+- missing_elements
+- improvement_recommendations
+"""
+
+
+def build_cv_generation_prompt(job: Dict[str, Any], original_cv: str, profile: Any, suggestions: Any) -> str:
+    return f"""
+You are a professional resume writer.
+
+Here is the job description:
+{_record(compact_job_description(job))}
+
+Here is the user's original CV (you may reuse strong content):
+{_record(compact_cv(original_cv))}
+
+Here is the user's structured profile:
+{profile}
+
+Here are the CV suggestions (missing skills, recommendations):
+{suggestions}
+
+🎯 Your task:
+- Reuse relevant content from the original CV
+- Add any missing skills or projects from the profile
+- Make the CV tailored to the job
+- Follow ATS-friendly formatting
+- Output in plain text: Name, Contact, Summary, Education, Skills, Projects, Experience
+"""
@@ -0,0 +1,155 @@
+import os
+import re
+import time
+import heapq
+import asyncio
+import itertools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+# --- Client-side budgets, matched to the account's OpenAI limits ---
+# These are per process. app.py, api.py, main.py and rank_jobs.py each run
+# their own limiter, so when several run at once, split the account's limits
+# between them (e.g. OPENAI_RPM=350 for app.py and 150 for rank_jobs.py).
+OPENAI_RPM = float(os.getenv("OPENAI_RPM", "500"))
+OPENAI_TPM = float(os.getenv("OPENAI_TPM", "200000"))
+# Completion tokens budgeted per request before the real usage is known
+EXPECTED_OUTPUT_TOKENS = int(os.getenv("EXPECTED_OUTPUT_TOKENS", "600"))
+
+# Lower value = served first
+INTERACTIVE = 0
+BATCH = 1
+
+request_priority: ContextVar[int] = ContextVar("request_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def priority(level: int):
+    """Run the enclosed calls (and tasks started inside) at the given priority."""
+    token = request_priority.set(level)
+    try:
+        yield
+    finally:
+        request_priority.reset(token)
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    # OpenAI reset headers look like "1s", "6m0s", "20ms"; retry-after is plain seconds
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    total = 0.0
+    for amount, unit in re.findall(r"([\d.]+)(ms|s|m|h)", value):
+        total += float(amount) * {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[unit]
+    return total or None
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        # Oversized requests only wait for a full bucket instead of forever
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute budget with priority ordering.
+
+    Waiters are served strictly by (priority, arrival), so interactive UI calls
+    overtake queued batch work. Rate-limit headers from the API tighten the
+    local buckets, and a 429 pauses everyone until the server's reset time.
+
+    Budgets and priorities only apply within one process; another process
+    sharing the API key is only noticed through those headers and 429s.
+    Pass rpm=tpm=math.inf for no limit (benchmarks with fake agents).
+    """
+
+    def __init__(self, rpm: float = OPENAI_RPM, tpm: float = OPENAI_TPM):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self._waiters: list = []
+        self._sequence = itertools.count()
+        self._changed: Optional[asyncio.Condition] = None
+        self._paused_until = 0.0
+
+    def _condition(self) -> asyncio.Condition:
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        return self._changed
+
+    async def acquire(self, tokens: int, level: Optional[int] = None) -> int:
+        """Wait for budget for one request of roughly `tokens` tokens; returns what was reserved."""
+        level = request_priority.get() if level is None else level
+        entry = (level, next(self._sequence))
+        changed = self._condition()
+        async with changed:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    self.requests.refill()
+                    self.tokens.refill()
+                    delay = max(
+                        self._paused_until - time.monotonic(),
+                        self.requests.wait_time(1),
+                        self.tokens.wait_time(tokens),
+                    )
+                    if self._waiters[0] == entry and delay <= 0:
+                        heapq.heappop(self._waiters)
+                        self.requests.level -= 1
+                        self.tokens.level -= min(tokens, self.tokens.capacity)
+                        changed.notify_all()
+                        return tokens
+                    try:
+                        await asyncio.wait_for(changed.wait(), timeout=max(delay, 0.01) if self._waiters[0] == entry else None)
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                    changed.notify_all()
+                raise
+
+    def settle(self, reserved: int, actual: Optional[int]):
+        """Correct the token bucket once the real usage of a request is known."""
+        if actual is not None:
+            self.tokens.level = min(self.tokens.capacity, self.tokens.level + reserved - actual)
+
+    def observe_headers(self, status_code: int, headers) -> None:
+        """Adapt to x-ratelimit-* headers and 429 responses from the API."""
+        remaining_requests = headers.get("x-ratelimit-remaining-requests")
+        remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+        if remaining_requests is not None:
+            self.requests.level = min(self.requests.level, float(remaining_requests))
+        if remaining_tokens is not None:
+            self.tokens.level = min(self.tokens.level, float(remaining_tokens))
+
+        if status_code == 429:
+            pause = (_parse_duration(headers.get("retry-after"))
+                     or _parse_duration(headers.get("x-ratelimit-reset-tokens"))
+                     or _parse_duration(headers.get("x-ratelimit-reset-requests"))
+                     or 1.0)
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+
+
+llm_rate_limiter = RateLimiter()
+
+
+def set_rate_limiter(limiter: RateLimiter):
+    """Swap the shared limiter, e.g. for an unlimited one in benchmarks."""
+    global llm_rate_limiter
+    llm_rate_limiter = limiter
@@ -0,0 +1,77 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional
+
+# --- Session limits ---
+SESSION_MAX = int(os.getenv("SESSION_MAX", "5000"))
+SESSION_IDLE_SECONDS = float(os.getenv("SESSION_IDLE_SECONDS", str(2 * 3600)))
+
+
+@dataclass(frozen=True)
+class SessionContext:
+    """What the CV analyzer leaves behind for the CV maker, per browser session."""
+    cv_text: Optional[str] = None
+    job_id: Optional[str] = None
+    job_info: Optional[Dict[str, Any]] = None
+    cv_suggestions: Optional[Dict[str, Any]] = None
+    updated_at: float = 0.0
+
+
+EMPTY_SESSION = SessionContext()
+
+
+class SessionStore:
+    """Session-scoped state with bounded memory and idle eviction.
+
+    Each session maps to an immutable SessionContext. Writers swap in a new
+    object under a lock; readers only do a dict lookup, so they never block.
+    """
+
+    def __init__(self, max_sessions: int = SESSION_MAX, idle_seconds: float = SESSION_IDLE_SECONDS):
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self._sessions: "OrderedDict[str, SessionContext]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> SessionContext:
+        context = self._sessions.get(session_id)
+        if context is None or time.time() - context.updated_at > self.idle_seconds:
+            return EMPTY_SESSION
+        return context
+
+    def update(self, session_id: str, **fields) -> SessionContext:
+        with self._lock:
+            current = self._sessions.get(session_id, EMPTY_SESSION)
+            context = replace(current, updated_at=time.time(), **fields)
+            self._sessions[session_id] = context
+            self._sessions.move_to_end(session_id)
+            self._evict()
+        return context
+
+    def drop(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def _evict(self):
+        # Oldest-updated sessions sit at the front
+        cutoff = time.time() - self.idle_seconds
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if len(self._sessions) > self.max_sessions or oldest.updated_at < cutoff:
+                self._sessions.popitem(last=False)
+            else:
+                break
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+session_store = SessionStore()
+
+
+def session_id_of(request) -> str:
+    """Gradio's per-tab session hash; falls back to one shared session outside a request."""
+    return getattr(request, "session_hash", None) or "default"
@@ -0,0 +1,172 @@
+import os
+import time
+import uuid
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from Logic.metrics import registry, span, METRICS_ENABLED
+from Logic.rate_limit import priority, BATCH
+
+# --- Queue settings ---
+TASK_WORKERS = int(os.getenv("TASK_WORKERS", "8"))
+TASK_MAX_QUEUED = int(os.getenv("TASK_MAX_QUEUED", "1000"))
+TASK_KEEP_FINISHED = int(os.getenv("TASK_KEEP_FINISHED", "1000"))
+# Progress events kept per task (cv_batch events carry whole CVs); older ones are dropped
+TASK_MAX_EVENTS = int(os.getenv("TASK_MAX_EVENTS", "100"))
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+# handler(payload, emit) -> result; emit(event) publishes one progress event
+Handler = Callable[[Dict[str, Any], Callable[[Dict[str, Any]], None]], Awaitable[Any]]
+
+
+class QueueFull(Exception):
+    pass
+
+
+@dataclass
+class Task:
+    id: str
+    kind: str
+    payload: Dict[str, Any]
+    status: str = QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    dropped_events: int = 0
+    changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    @property
+    def emitted(self) -> int:
+        return self.dropped_events + len(self.events)
+
+    def emit(self, event: Dict[str, Any]):
+        self.events.append(event)
+        if len(self.events) > TASK_MAX_EVENTS:
+            del self.events[0]
+            self.dropped_events += 1
+        # Wake every listener, then re-arm for the next event
+        self.changed.set()
+        self.changed.clear()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "task_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress_events": self.emitted,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class TaskQueue:
+    """In-process job queue drained by a fixed pool of asyncio workers.
+
+    Submissions are rejected with QueueFull once `max_queued` are waiting.
+    Finished tasks are kept for polling until `keep_finished` newer ones push
+    them out; their payload is released and only the final event is kept. Work runs at BATCH priority, so interactive calls in the same
+    process (the Gradio UI when api.py mounts it with API_MOUNT_UI=1) are
+    served first by the LLM rate limiter. A separately launched app.py has
+    its own limiter and budget; see Logic/rate_limit.py.
+    """
+
+    def __init__(self, workers: int = TASK_WORKERS, max_queued: int = TASK_MAX_QUEUED,
+                 keep_finished: int = TASK_KEEP_FINISHED):
+        self.workers = workers
+        self.max_queued = max_queued
+        self.keep_finished = keep_finished
+        self._handlers: Dict[str, Handler] = {}
+        self._tasks: Dict[str, Task] = {}
+        self._finished: deque = deque()
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    def register(self, kind: str, handler: Handler):
+        self._handlers[kind] = handler
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, kind: str, payload: Dict[str, Any]) -> Task:
+        if kind not in self._handlers:
+            raise KeyError(kind)
+        task = Task(id=uuid.uuid4().hex, kind=kind, payload=payload)
+        try:
+            self._queue.put_nowait(task)
+        except asyncio.QueueFull:
+            raise QueueFull(f"{self._queue.qsize()} tasks already queued")
+        self._tasks[task.id] = task
+        self._count(kind, QUEUED)
+        return task
+
+    def get(self, task_id: str) -> Optional[Task]:
+        return self._tasks.get(task_id)
+
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def events(self, task_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Progress events of a task, replayed from the oldest one kept, until it finishes."""
+        task = self._tasks[task_id]
+        sent = 0
+        while True:
+            # Events dropped since the last wake-up are skipped
+            sent = max(sent, task.dropped_events)
+            while sent < task.emitted:
+                yield task.events[sent - task.dropped_events]
+                sent += 1
+            if task.finished:
+                return
+            await task.changed.wait()
+
+    async def _work(self):
+        while True:
+            task = await self._queue.get()
+            task.status, task.started_at = RUNNING, time.time()
+            task.emit({"status": RUNNING})
+            try:
+                with priority(BATCH), span(f"task.{task.kind}"):
+                    task.result = await self._handlers[task.kind](task.payload, task.emit)
+                task.status = DONE
+            except asyncio.CancelledError:
+                task.status, task.error = FAILED, "cancelled"
+                raise
+            except Exception as e:
+                print(f" ****** Error in {task.kind} task {task.id}: {e}")
+                task.status, task.error = FAILED, str(e)
+            finally:
+                task.finished_at = time.time()
+                task.emit({"status": task.status, "error": task.error})
+                # The result and the final event are all a finished task still needs
+                task.payload = {}
+                task.dropped_events += len(task.events) - 1
+                del task.events[:-1]
+                self._count(task.kind, task.status)
+                self._finished.append(task.id)
+                while len(self._finished) > self.keep_finished:
+                    self._tasks.pop(self._finished.popleft(), None)
+                self._queue.task_done()
+
+    @staticmethod
+    def _count(kind: str, status: str):
+        if METRICS_ENABLED:
+            registry.inc("tasks_total", help="API tasks by kind and state reached", kind=kind, status=status)
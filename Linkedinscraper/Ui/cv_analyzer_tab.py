@@ -1,55 +1,22 @@
 # File: ui/cv_analyzer_tab.py
 
 import gradio as gr
-from agents.jobextractor import get_job_details_by_id
 from agents.jobanalyser import job_analyser_agent
 from Logic.job_cache import get_or_cache_job
+from Logic.prompts import build_cv_analysis_prompt
+from Logic.pdf_text import extract_pdf_text
+from Logic.session_store import session_store, session_id_of
+from Logic.history_store import history_store
 import asyncio
-import fitz
+import os
 
-def extract_text_from_pdf(pdf_file) -> str:
-    doc = fitz.open(pdf_file.name)
-    return "\n".join(page.get_text() for page in doc)
+CV_ANALYZE_CONCURRENCY = int(os.getenv("CV_ANALYZE_CONCURRENCY", "8"))
 
-async def analyze_job_fit(job_id: str, cv_file, shared_cv_text, shared_job_id, shared_job_info, shared_cv_suggestions) :
-    if cv_file is not None:
-        cv = extract_text_from_pdf(cv_file)
-    else:
-        return " Please upload a PDF or paste your CV.", gr.update(visible=False)
-
-    job = get_or_cache_job(job_id)
-    if not job:
-        return " Could not fetch job details. Please check the Job ID.", gr.update(visible=False)
-    job_info = job["job_info"]
-    company_info = job["company_info"]
-
-    job_text = f"""Job Title: {job_info['title']}
-Company: {company_info['name']}
-Location: {job_info.get('location', 'N/A')}
-Description: {job_info['description']}"""
-
-    llm_input = f"""
-You are a job application coach. Analyze how well the following CV matches the provided job posting.
-
-=== Job Posting ===
-{job_text}
+async def extract_text_from_pdf(pdf_file) -> str:
+    return await extract_pdf_text(pdf_file.name)
 
-=== User CV ===
-{cv}
-
-Return your answer as a JSON object with:
-- summary
-- score (0–100)
-- required_skills
-- matched_skills
-- missing_skills
-- cv_recommendations
-"""
-
-    result = await job_analyser_agent.run(llm_input)
-    output = result.output[0]
-
-    formatted = (
+def format_analysis(output) -> str:
+    return (
         f"###  Job Summary\n{output.summary}\n\n"
         f"###  Confidence Score: **{output.score}** / 100\n\n"
         f"###  Required Skills:\n- " + "\n- ".join(output.required_skills) + "\n\n"
@@ -58,40 +25,71 @@ Return your answer as a JSON object with:
         f"###  CV Recommendations:\n- " + "\n- ".join(output.cv_recommendations)
     )
 
-    # Update shared state variables
-    shared_cv_text.value = cv
-    shared_job_id.value = job_id
-    shared_job_info.value = job
-    shared_cv_suggestions.value = {
-        "summary": output.summary,
-        "score": output.score,
-        "required_skills": output.required_skills,
-        "matched_skills": output.matched_skills,
-        "missing_skills": output.missing_skills,
-        "cv_recommendations": output.cv_recommendations
-        }
+async def analyze_job_fit(job_id: str, cv_file, session_id: str) :
+    if cv_file is not None:
+        cv = await extract_text_from_pdf(cv_file)
+    else:
+        yield " Please upload a PDF or paste your CV.", gr.update(visible=False)
+        return
 
+    job = await get_or_cache_job(job_id)
+    if not job:
+        yield " Could not fetch job details. Please check the Job ID.", gr.update(visible=False)
+        return
+    llm_input = build_cv_analysis_prompt(job, cv)
+
+    # Render each partial analysis as it streams in
+    output = None
+    async for partial in job_analyser_agent.stream_output(llm_input):
+        if partial:
+            output = partial[0]
+            yield format_analysis(output), gr.update(visible=False)
+
+    if output is None:
+        yield " The analysis came back empty. Please try again.", gr.update(visible=False)
+        return
+
+    history_store.record({
+        **output.model_dump(),
+        "job_id": str(job_id),
+        "title": job["job_info"].get("title"),
+        "company": job["company_info"].get("name"),
+        "link": job["job_info"].get("job_url"),
+    }, source="cv_analyzer")
+
+    # Remember this analysis for the CV maker tab of the same session
+    session_store.update(
+        session_id,
+        cv_text=cv,
+        job_id=job_id,
+        job_info=job,
+        cv_suggestions={
+            "summary": output.summary,
+            "score": output.score,
+            "required_skills": output.required_skills,
+            "matched_skills": output.matched_skills,
+            "missing_skills": output.missing_skills,
+            "cv_recommendations": output.cv_recommendations
+        },
+    )
 
-    return formatted, gr.update(visible=False)
 
-def cv_analyzer_tab(shared_cv_text, shared_job_id, shared_job_info, shared_cv_suggestions):
+def cv_analyzer_tab():
     uploaded_cv_file = gr.File(label="Upload CV (PDF)", file_types=[".pdf"])
     job_id_input = gr.Textbox(label="LinkedIn Job ID")
     analyze_btn = gr.Button("Analyze CV Fit", variant="primary")
     loading = gr.Markdown("⏳ Analyzing...", visible=False)
     analysis_output = gr.Markdown()
 
-    async def run_analysis(job_id, file):
-        result, _ = await analyze_job_fit(job_id, file,shared_cv_text,
-        shared_job_id,
-        shared_job_info,
-        shared_cv_suggestions)
-        return result
+    async def run_analysis(job_id, file, request: gr.Request):
+        async for result, _ in analyze_job_fit(job_id, file, session_id_of(request)):
+            yield result
     
     analyze_btn.click(
         fn=run_analysis,
         inputs=[job_id_input, uploaded_cv_file],
-        outputs=[analysis_output]
+        outputs=[analysis_output],
+        concurrency_limit=CV_ANALYZE_CONCURRENCY
         )
 
 
@@ -1,29 +1,38 @@
 # File: ui/cv_maker_tab.py
 
 import gradio as gr
-import json
-from langgraph.cv_graph import build_cv_graph, CVState
+import os
+import tempfile
+from langgraph.cv_graph import cv_workflow, CVState
+from Logic.session_store import session_store, session_id_of
+from Logic.profile_store import profile_store, user_id_of
+from Logic.pdf_text import extract_pdf_text
+from Logic.cv_batch import generate_cvs
 
-async def run_cv_generation(shared_cv_text, shared_job_id, shared_job_info, shared_cv_suggestions):
+CV_GENERATE_CONCURRENCY = int(os.getenv("CV_GENERATE_CONCURRENCY", "4"))
+
+async def run_cv_generation(session_id: str, user_id: str):
     # Load user profile
-    try:
-        with open("data/user_profile.json", "r", encoding="utf-8") as f:
-            profile = json.load(f)
-    except FileNotFoundError:
-        return " No saved user profile found. Please complete and save your profile."
+    stored = profile_store.get(user_id)
+    if stored is None:
+        yield " No saved user profile found. Please complete and save your profile."
+        return
 
-    job = shared_job_info.value
-    job_id = shared_job_id.value
-    cv_text = shared_cv_text.value
-    suggestions = shared_cv_suggestions.value
+    context = session_store.get(session_id)
+    job = context.job_info
+    job_id = context.job_id
+    cv_text = context.cv_text
+    suggestions = context.cv_suggestions
 
     if not all([job, job_id, cv_text, suggestions]):
-        return " Missing context. Please analyze your CV first."
+        yield " Missing context. Please analyze your CV first."
+        return
 
-    # Prepare and run the LangGraph flow
+    # Prepare and run the LangGraph flow (job and suggestions are reused, so only GenerateCV runs)
     initial_state = CVState(
         job_id=job_id,
-        profile=profile,
+        profile=stored.profile,
+        profile_text=stored.profile_text,
         job=job,
         cv_text=cv_text,
         original_cv=cv_text,
@@ -31,29 +40,74 @@ async def run_cv_generation(shared_cv_text, shared_job_id, shared_job_info, shar
         final_cv=None
     )
 
-    workflow = build_cv_graph()
-    result = await workflow.ainvoke(initial_state)
-    return result["final_cv"]
+    # Stream partial CV text as GenerateCV produces it
+    async for _, chunk in cv_workflow.astream(initial_state, stream_mode=["custom", "values"]):
+        if chunk.get("final_cv"):
+            yield chunk["final_cv"]
+
+async def run_batch_cv_generation(job_ids_text: str, cv_file, user_id: str):
+    """Yields (progress markdown, paths of the CVs written so far)."""
+    stored = profile_store.get(user_id)
+    if stored is None:
+        yield " No saved user profile found. Please complete and save your profile.", []
+        return
+    if cv_file is None:
+        yield " Please upload your original CV.", []
+        return
+    job_ids = [part.strip() for part in job_ids_text.replace(",", "\n").splitlines() if part.strip()]
+    if not job_ids:
+        yield " Please enter at least one Job ID.", []
+        return
 
-def cv_maker_tab(shared_cv_text, shared_job_id, shared_job_info, shared_cv_suggestions):
+    cv_text = await extract_pdf_text(cv_file.name)
+    output_dir = tempfile.mkdtemp(prefix="tailored_cvs_")
+    lines, paths = {}, []
+    async for event in generate_cvs(job_ids, cv_text, stored.profile, stored.profile_text, output_dir=output_dir):
+        if event["status"] == "started":
+            lines[event["job_id"]] = f"- ⏳ `{event['job_id']}` generating..."
+        elif event["status"] == "done":
+            lines[event["job_id"]] = f"- ✅ `{event['job_id']}` {event['title']} at {event['company']} (score {event['score']})"
+            paths.append(event["path"])
+        else:
+            lines[event["job_id"]] = f"- ❌ `{event['job_id']}` {event['error']}"
+        header = f"**{event['completed']} / {event['total']} done**\n\n"
+        yield header + "\n".join(lines.values()), list(paths)
+
+def cv_maker_tab():
     with gr.Tab("🧾 Generate Final CV"):
         gr.Markdown("This tab uses your latest CV analysis to generate a tailored resume.")
         
         generate_btn = gr.Button("Generate Tailored CV", variant="primary")
         output = gr.Textbox(label="Generated CV", lines=25)
 
-        # Async wrapper for Gradio
-        async def generate_click_handler():
-            return await run_cv_generation(
-                shared_cv_text,
-                shared_job_id,
-                shared_job_info,
-                shared_cv_suggestions
-            )
+        # Async generator wrapper for Gradio, so the textbox fills in progressively
+        async def generate_click_handler(request: gr.Request):
+            async for partial_cv in run_cv_generation(session_id_of(request), user_id_of(request)):
+                yield partial_cv
 
         #  Hook up click event
         generate_btn.click(
             fn=generate_click_handler,
             inputs=[],
-            outputs=[output]
+            outputs=[output],
+            concurrency_limit=CV_GENERATE_CONCURRENCY
+        )
+
+        # Batch mode: one tailored CV per job, generated concurrently
+        gr.Markdown("### Generate CVs for several jobs")
+        batch_job_ids = gr.Textbox(label="Job IDs (one per line or comma-separated)", lines=4)
+        batch_cv_file = gr.File(label="Original CV (PDF)", file_types=[".pdf"])
+        batch_btn = gr.Button("Generate CVs for all jobs")
+        batch_progress = gr.Markdown()
+        batch_files = gr.File(label="Generated CVs", file_count="multiple")
+
+        async def batch_click_handler(job_ids_text, cv_file, request: gr.Request):
+            async for progress, paths in run_batch_cv_generation(job_ids_text, cv_file, user_id_of(request)):
+                yield progress, paths
+
+        batch_btn.click(
+            fn=batch_click_handler,
+            inputs=[batch_job_ids, batch_cv_file],
+            outputs=[batch_progress, batch_files],
+            concurrency_limit=CV_GENERATE_CONCURRENCY
         )
@@ -0,0 +1,96 @@
+# File: ui/history_tab.py
+
+import gradio as gr
+import os
+import tempfile
+import time
+from Logic.history_store import history_store, HistoryFilter
+
+LIST_COLUMNS = ["id", "date", "source", "job_id", "title", "company", "score", "link"]
+SOURCES = ["", "batch", "cv_analyzer", "profile_analyzer"]
+
+def build_filter(company, skill, source, min_score) -> HistoryFilter:
+    return HistoryFilter(
+        company=company.strip() or None,
+        skill=skill.strip() or None,
+        source=source or None,
+        min_score=int(min_score) if min_score else None,
+    )
+
+def to_rows(entries):
+    return [
+        [e["id"], time.strftime("%Y-%m-%d %H:%M", time.localtime(e["created_at"])), e["source"],
+         e["job_id"], e["title"], e["company"], e["score"], e.get("link", "")]
+        for e in entries
+    ]
+
+def format_compare(ids_text: str) -> str:
+    ids = [int(part) for part in ids_text.replace(",", " ").split() if part.isdigit()]
+    table = history_store.compare(ids)
+    if not table["id"]:
+        return " No analyses found for those IDs."
+
+    def cell(value):
+        if isinstance(value, list):
+            value = "<br>".join(str(v) for v in value)
+        return str(value if value is not None else "—").replace("|", "\\|").replace("\n", " ")
+
+    lines = ["| | " + " | ".join(f"#{i}" for i in table["id"]) + " |",
+             "|---|" + "---|" * len(table["id"])]
+    for field, values in table.items():
+        if field != "id" and any(v is not None for v in values):
+            lines.append(f"| **{field}** | " + " | ".join(cell(v) for v in values) + " |")
+    return "\n".join(lines)
+
+def history_tab():
+    gr.Markdown("Every analysis is saved here. Filter, compare and export your results.")
+
+    with gr.Row():
+        company = gr.Textbox(label="Company")
+        skill = gr.Textbox(label="Required skill")
+        source = gr.Dropdown(SOURCES, value="", label="Source")
+        min_score = gr.Number(label="Min score", precision=0)
+
+    with gr.Row():
+        search_btn = gr.Button("Search", variant="primary")
+        next_btn = gr.Button("Next page")
+        top_n = gr.Number(value=10, label="Top N", precision=0)
+        top_btn = gr.Button("Top by score")
+
+    results = gr.Dataframe(headers=LIST_COLUMNS, interactive=False, wrap=True)
+    cursor = gr.State(None)
+
+    with gr.Row():
+        compare_ids = gr.Textbox(label="Compare analyses (IDs, comma-separated)")
+        compare_btn = gr.Button("Compare")
+    compare_output = gr.Markdown()
+
+    with gr.Row():
+        export_format = gr.Radio(["csv", "jsonl"], value="csv", label="Export format")
+        export_btn = gr.Button("Export filtered history")
+    export_file = gr.File(label="Download")
+
+    def search(company, skill, source, min_score):
+        entries, next_cursor = history_store.page(build_filter(company, skill, source, min_score))
+        return to_rows(entries), next_cursor
+
+    def next_page(company, skill, source, min_score, current):
+        if current is None:
+            return gr.update(), None
+        entries, next_cursor = history_store.page(build_filter(company, skill, source, min_score), before=tuple(current))
+        return to_rows(entries), next_cursor
+
+    def top(company, skill, source, min_score, n):
+        return to_rows(history_store.top(int(n or 10), build_filter(company, skill, source, min_score))), None
+
+    def export(company, skill, source, min_score, fmt):
+        path = os.path.join(tempfile.mkdtemp(), f"analysis_history.{fmt}")
+        history_store.export(path, build_filter(company, skill, source, min_score))
+        return path
+
+    filters = [company, skill, source, min_score]
+    search_btn.click(fn=search, inputs=filters, outputs=[results, cursor])
+    next_btn.click(fn=next_page, inputs=filters + [cursor], outputs=[results, cursor])
+    top_btn.click(fn=top, inputs=filters + [top_n], outputs=[results, cursor])
+    compare_btn.click(fn=format_compare, inputs=[compare_ids], outputs=[compare_output])
+    export_btn.click(fn=export, inputs=filters + [export_format], outputs=[export_file])
@@ -1,57 +1,35 @@
 # File: ui/profile_analyzer_tab.py
 
 import gradio as gr
-import json
 import asyncio
-from agents.jobextractor import get_job_details_by_id
+import os
 from agents.profileanalyser import profile_analyser_agent
 from Logic.job_cache import get_or_cache_job
+from Logic.profile_store import profile_store, user_id_of
+from Logic.prompts import build_profile_analysis_prompt
+from Logic.history_store import history_store
 
-async def analyze_profile_fit(job_id: str):
-    try:
-        with open("data/user_profile.json", "r", encoding="utf-8") as f:
-            profile = json.load(f)
-    except FileNotFoundError:
+PROFILE_ANALYZE_CONCURRENCY = int(os.getenv("PROFILE_ANALYZE_CONCURRENCY", "8"))
+
+async def analyze_profile_fit(job_id: str, user_id: str):
+    stored = profile_store.get(user_id)
+    if stored is None:
         return " No saved user profile found. Please complete and save your profile.", gr.update(visible=False)
 
-    job = get_or_cache_job(job_id)
+    job = await get_or_cache_job(job_id)
     if not job:
         return " Could not fetch job details. Check the Job ID.", gr.update(visible=False)
-    job_info = job["job_info"]
-    company_info = job["company_info"]
-
-    job_text = f"""Job Title: {job_info['title']}
-Company: {company_info['name']}
-Location: {job_info.get('location', 'N/A')}
-Description: {job_info['description']}"""
-
-    profile_text = f"""Name: {profile['name']}
-University: {profile['university']}
-Degree: {profile['degree']}
-Courses: {profile['courses']}
-Experience: {', '.join(profile['experience']) if isinstance(profile['experience'], list) else profile['experience']}
-Skills: {profile['skills']}
-Projects: {', '.join(profile['projects']) if isinstance(profile['projects'], list) else profile['projects']}"""
-
-    llm_input = f"""
-Compare the following user profile with the job description.
-
-=== Job Description ===
-{job_text}
-
-=== User Profile ===
-{profile_text}
-
-Return a JSON with:
-- score (0–100)
-- summary
-- matched_elements
-- missing_elements
-- improvement_recommendations
-"""
+    llm_input = build_profile_analysis_prompt(job, stored.profile_text)
 
     result = await profile_analyser_agent.run(llm_input)
     output = result.output[0]
+    history_store.record({
+        **output.model_dump(),
+        "job_id": str(job_id),
+        "title": job["job_info"].get("title"),
+        "company": job["company_info"].get("name"),
+        "link": job["job_info"].get("job_url"),
+    }, source="profile_analyzer", user_id=user_id)
 
     formatted = (
         f"###  Job Summary\n{output.summary}\n\n"
@@ -69,11 +47,12 @@ def profile_analyzer_ui():
         loading = gr.Markdown(" Analyzing...", visible=False)
         output = gr.Markdown()
 
-        async def run_profile_analysis(job_id):
-            return await analyze_profile_fit(job_id)
+        async def run_profile_analysis(job_id, request: gr.Request):
+            return await analyze_profile_fit(job_id, user_id_of(request))
 
         analyze_btn.click(
             fn=run_profile_analysis,
             inputs=[job_id_input],
-            outputs=[output]
+            outputs=[output],
+            concurrency_limit=PROFILE_ANALYZE_CONCURRENCY
         )
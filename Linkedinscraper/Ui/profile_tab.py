@@ -1,19 +1,31 @@
 # File: ui/profile_tab.py
 
 import gradio as gr
-import os, json
 from typing import List
+from Logic.profile_store import profile_store, user_id_of, DEFAULT_USER
 
-def load_profile():
-    try:
-        with open("data/user_profile.json", "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
+def load_profile(user_id: str = DEFAULT_USER) -> dict:
+    stored = profile_store.get(user_id)
+    return stored.profile if stored else {}
 
-preloaded = load_profile()
+def load_profile_fields(request: gr.Request):
+    # Runs on every page load, so the form always shows the latest saved profile
+    profile = load_profile(user_id_of(request))
+    experience = profile.get("experience", [])
+    projects = profile.get("projects", [])
+    return (
+        profile.get("name", ""),
+        profile.get("university", ""),
+        profile.get("degree", ""),
+        profile.get("courses", ""),
+        profile.get("skills", ""),
+        experience,
+        ", ".join(experience),
+        projects,
+        ", ".join(projects),
+    )
 
-def save_profile(name_val, uni, deg, crs, exp_list, skl, proj_list):
+def save_profile(name_val, uni, deg, crs, exp_list, skl, proj_list, request: gr.Request):
     profile = {
         "name": name_val,
         "university": uni,
@@ -23,10 +35,9 @@ def save_profile(name_val, uni, deg, crs, exp_list, skl, proj_list):
         "skills": skl,
         "projects": proj_list
     }
-    os.makedirs("data", exist_ok=True)
-    with open("data/user_profile.json", "w", encoding="utf-8") as f:
-        json.dump(profile, f, indent=2)
-    return gr.update(visible=True), " Profile saved to data/user_profile.json!"
+    user_id = user_id_of(request)
+    profile_store.save(profile, user_id)
+    return gr.update(visible=True), f" Profile saved to {profile_store.path_for(user_id)}!"
 
 def add_item(new_item, current_list: List[str]):
     if new_item:
@@ -35,6 +46,8 @@ def add_item(new_item, current_list: List[str]):
     return ", ".join(current_list), current_list
 
 def profile_ui():
+    preloaded = load_profile()
+
     name = gr.Textbox(label="Full Name", value=preloaded.get("name", ""))
     university = gr.Textbox(label="University", value=preloaded.get("university", ""))
     degree = gr.Textbox(label="Degree", value=preloaded.get("degree", ""))
@@ -71,3 +84,6 @@ def profile_ui():
         inputs=[name, university, degree, courses, experience_list, skills, project_list],
         outputs=[save_status, save_status]
         )
+
+    # In the order load_profile_fields returns them
+    return [name, university, degree, courses, skills, experience_list, experience_display, project_list, project_display]
@@ -1,14 +1,9 @@
 # File: agents/cv_maker.py
 
-from pydantic_ai import Agent
 from pydantic import BaseModel, Field
 from typing import List
-from pydantic_ai.models.openai import OpenAIModel
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-model = OpenAIModel("gpt-4o-mini")
+from agents.llm_cache import CachedAgent
+from agents.registry import build_agent, CV_MODEL
 
 class CVOutput(BaseModel):
     cv: str = Field(description="A fully tailored CV based on the job and profile")
@@ -34,8 +29,11 @@ Highlight strengths that match the job.
 Format clearly and professionally.
 """
 
-cv_maker_agent = Agent(
-    model=model,
+# Built lazily by the registry the first time the agent is used
+cv_maker_agent = CachedAgent(
+    lambda: build_agent(system_prompt, CVOutput, CV_MODEL),
+    model_name=CV_MODEL,
+    name="cv_maker",
     system_prompt=system_prompt,
     result_type=CVOutput,
 )
@@ -1,14 +1,10 @@
-from pydantic_ai import Agent
 from pydantic import BaseModel, Field
-from typing import List
-from pydantic_ai.models.openai import OpenAIModel
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-model = OpenAIModel("gpt-4o-mini")
+from typing import List, Optional
+from agents.llm_cache import CachedAgent
+from agents.registry import build_agent, SCORE_MODEL, DETAIL_MODEL
 
 class JobAnalyser(BaseModel):
+    job_id: Optional[str] = Field(default=None, description="The job ID this analysis belongs to, when several jobs are sent at once")
     score: int = Field(description="The confidence score (0-100) for the job posting")
     summary: str = Field(description="A summary of the job posting")
     required_skills: List[str] = Field(description="List of required skills for the job")
@@ -16,6 +12,10 @@ class JobAnalyser(BaseModel):
     missing_skills: List[str] = Field(description="Skills from the required list that are missing in the user's CV")
     cv_recommendations: List[str] = Field(description="Specific suggestions to improve the CV for this job")
 
+class JobScore(BaseModel):
+    job_id: Optional[str] = Field(default=None, description="The job ID this score belongs to")
+    score: int = Field(description="How well the CV matches the job posting (0-100)")
+
 system_prompt = """
 You are an AI career assistant.
 
@@ -56,8 +56,27 @@ Based on the above, return a JSON object with the following **exact keys** and s
 ❗ Do not add any extra commentary. Only return the structured JSON object. Ensure keys are always present and correctly named.
 """
 
-job_analyser_agent = Agent(
-    model=model,
+# Built lazily by the registry the first time the agent is used
+job_analyser_agent = CachedAgent(
+    lambda: build_agent(system_prompt, List[JobAnalyser], DETAIL_MODEL),
+    model_name=DETAIL_MODEL,
+    name="job_analyser",
     system_prompt=system_prompt,
     result_type=List[JobAnalyser],
 )
+
+score_system_prompt = """
+You are an AI career assistant. Rate how well a user's CV matches each job posting.
+
+Return only a job_id and an integer score from 0 to 100 per posting. No summaries, skills or commentary.
+"""
+
+# First tier of the cascade: short output, so it can run on a small, fast model
+job_scorer_agent = CachedAgent(
+    lambda: build_agent(score_system_prompt, List[JobScore], SCORE_MODEL),
+    model_name=SCORE_MODEL,
+    name="job_scorer",
+    system_prompt=score_system_prompt,
+    result_type=List[JobScore],
+    expected_output_tokens=100,
+)
@@ -1,24 +1,199 @@
 # File: agents/jobextractor.py
 
-from apify_client import ApifyClient
-from dotenv import load_dotenv
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Optional
+import asyncio
+import json
 import os
+from dotenv import load_dotenv
+from Logic.metrics import span
 
 load_dotenv()
 APIFY_API_TOKEN = os.getenv("APIFY_API_TOKEN")
+ACTOR_ID = "apimaestro/linkedin-job-detail"
+
+# --- Batching settings for the async fetcher ---
+FETCH_MAX_BATCH = int(os.getenv("FETCH_MAX_BATCH", "25"))
+FETCH_WAIT_WINDOW = float(os.getenv("FETCH_WAIT_WINDOW", "0.05"))
+# Actor runs allowed at once; further batches wait for a free slot
+FETCH_MAX_RUNS = int(os.getenv("FETCH_MAX_RUNS", "4"))
+# How often a running actor's dataset is checked for new items (seconds)
+FETCH_POLL_INTERVAL = float(os.getenv("FETCH_POLL_INTERVAL", "1.0"))
+RUN_FINISHED = {"SUCCEEDED", "FAILED", "ABORTED", "TIMED-OUT"}
+
+
+def job_id_of(job: Dict[str, Any]) -> str:
+    # job_url looks like https://www.linkedin.com/jobs/view/<id>/
+    return job["job_info"]["job_url"].rstrip("/").split("/")[-1]
+
+
+# --- Backends: where actor runs and dataset items come from ---
+class ApifyBackend:
+    """Runs the LinkedIn job-detail actor through one shared async client."""
+
+    def __init__(self, token: Optional[str] = APIFY_API_TOKEN):
+        from apify_client import ApifyClientAsync
+        self.client = ApifyClientAsync(token)
+
+    async def run(self, job_ids: List[str]) -> AsyncIterator[Dict[str, Any]]:
+        """Start the actor and page its dataset while it runs, yielding items as they land."""
+        run = await self.client.actor(ACTOR_ID).start(run_input={"job_id": job_ids})
+        run_client = self.client.run(run["id"])
+        dataset = self.client.dataset(run["defaultDatasetId"])
+        status, offset = run["status"], 0
+        while True:
+            # Status is read before the page, so the last page after the run ends is never missed
+            finished = status in RUN_FINISHED
+            page = await dataset.list_items(offset=offset)
+            for item in page.items:
+                yield item
+            offset += len(page.items)
+            if page.items:
+                continue
+            if finished:
+                break
+            await asyncio.sleep(FETCH_POLL_INTERVAL)
+            status = ((await run_client.get()) or {}).get("status", "FAILED")
+        if status != "SUCCEEDED":
+            print(f" ****** Actor run {run['id']} ended with status {status}")
+
+
+class FakeBackend:
+    """Serves jobs from a dict or from cached data/job_<id>.json files, no network."""
+
+    def __init__(self, jobs: Optional[Dict[str, Dict[str, Any]]] = None, data_dir: str = "data", latency: float = 0.0):
+        self.jobs = jobs or {}
+        self.data_dir = data_dir
+        self.latency = latency
+        self.runs: List[List[str]] = []
+
+    async def run(self, job_ids: List[str]) -> AsyncIterator[Dict[str, Any]]:
+        self.runs.append(list(job_ids))
+        for job_id in job_ids:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            job = self.jobs.get(job_id)
+            if job is None:
+                path = os.path.join(self.data_dir, f"job_{job_id}.json")
+                if not os.path.exists(path):
+                    continue
+                with open(path, "r", encoding="utf-8") as f:
+                    job = json.load(f)
+            yield job
+
+
+# --- Async fetcher: coalesces concurrent callers into one actor run ---
+class JobFetcher:
+    def __init__(self, backend=None, max_batch: int = FETCH_MAX_BATCH, wait_window: float = FETCH_WAIT_WINDOW,
+                 max_runs: int = FETCH_MAX_RUNS):
+        self.backend = backend
+        self.max_batch = max_batch
+        self.wait_window = wait_window
+        self._run_slots = asyncio.Semaphore(max_runs)
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._running: set = set()
+
+    def _get_backend(self):
+        if self.backend is None:
+            self.backend = ApifyBackend()
+        return self.backend
+
+    def _enqueue(self, job_id: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(job_id, []).append(future)
+
+        if len(self._pending) >= self.max_batch:
+            self._start_batch()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+        return future
+
+    async def _flush_after_window(self):
+        await asyncio.sleep(self.wait_window)
+        self._flush_task = None
+        self._start_batch()
+
+    def _start_batch(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        task = asyncio.create_task(self._run_batch(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, batch: Dict[str, List[asyncio.Future]]):
+        try:
+            async with self._run_slots:
+                with span("apify.actor_run", jobs=len(batch)):
+                    async for item in self._get_backend().run(list(batch)):
+                        for future in batch.pop(job_id_of(item), []):
+                            if not future.done():
+                                future.set_result(item)
+        except Exception as e:
+            print(f" ****** Error fetching job details: {e}")
+        # Anything the actor did not return resolves to None
+        for futures in batch.values():
+            for future in futures:
+                if not future.done():
+                    future.set_result(None)
+
+    async def fetch(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self._enqueue(str(job_id))
+
+    async def fetch_many(self, job_ids: List[str]) -> List[Dict[str, Any]]:
+        jobs = await asyncio.gather(*(self.fetch(job_id) for job_id in job_ids))
+        return [job for job in jobs if job]
+
+    async def stream(self, job_ids: List[str]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield jobs in the order the actor returns them, not the input order."""
+        futures = [self._enqueue(str(job_id)) for job_id in job_ids]
+        for next_done in asyncio.as_completed(futures):
+            job = await next_done
+            if job:
+                yield job
+
+
+job_fetcher = JobFetcher()
+
+
+def set_backend(backend):
+    """Swap the backend of the shared fetcher, e.g. FakeBackend() for offline runs."""
+    job_fetcher.backend = backend
+
+
+async def fetch_job(job_id: str) -> Optional[Dict[str, Any]]:
+    return await job_fetcher.fetch(job_id)
+
+
+async def fetch_jobs(job_ids: List[str]) -> List[Dict[str, Any]]:
+    return await job_fetcher.fetch_many(job_ids)
+
+
+def stream_jobs(job_ids: List[str]) -> AsyncIterator[Dict[str, Any]]:
+    return job_fetcher.stream(job_ids)
+
+
+# --- Blocking helper kept for scripts outside an event loop ---
+_sync_client = None
 
 def get_job_details_by_id(job_ids: List[str]) -> List[Dict[str, any]]:
-    client = ApifyClient(APIFY_API_TOKEN)
+    global _sync_client
+    if _sync_client is None:
+        from apify_client import ApifyClient
+        _sync_client = ApifyClient(APIFY_API_TOKEN)
+    client = _sync_client
 
     run_input = {
         "job_id": job_ids
     }
 
     try:
-        run = client.actor("apimaestro/linkedin-job-detail").call(run_input=run_input)
+        run = client.actor(ACTOR_ID).call(run_input=run_input)
         jobs = list(client.dataset(run["defaultDatasetId"]).iterate_items())
         return jobs
     except Exception as e:
         print(f" ****** Error fetching job details: {e}")
-        return []
\ No newline at end of file
+        return []
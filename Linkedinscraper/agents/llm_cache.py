@@ -0,0 +1,171 @@
+# File: agents/llm_cache.py
+
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+from pydantic import TypeAdapter
+from Logic.metrics import span, record_cache, record_usage
+from Logic import rate_limit
+from Logic.rate_limit import EXPECTED_OUTPUT_TOKENS
+from Logic.prompts import estimate_tokens
+
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2048"))
+
+
+@dataclass
+class CachedRunResult:
+    """Stand-in for a pydantic-ai run result when the output comes from the cache."""
+    output: Any
+    cached: bool = True
+
+    def usage(self):
+        return None
+
+
+def normalize_prompt(prompt: str) -> str:
+    return re.sub(r"\s+", " ", prompt).strip()
+
+
+def is_usable(output: Any) -> bool:
+    """Empty outputs (None, [], "") are never cached, so a retry asks the model again."""
+    if output is None:
+        return False
+    if isinstance(output, (list, tuple, dict, str)):
+        return len(output) > 0
+    return True
+
+
+class CachedAgent:
+    """Wraps a pydantic-ai Agent and reuses validated outputs for identical requests.
+
+    The key covers model name, system prompt, normalized prompt and output schema,
+    so changing any of them naturally misses the cache. Only outputs that pass
+    `validate` are stored; `refresh=True` skips the lookup (used by retries).
+    The Agent itself is only built by `build_agent` on first use.
+    """
+
+    def __init__(self, build_agent: Callable[[], Any], model_name: str, system_prompt: str, result_type: Any,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES, name: str = "agent",
+                 expected_output_tokens: int = EXPECTED_OUTPUT_TOKENS):
+        self._build_agent = build_agent
+        self._agent = None
+        self.name = name
+        self.model_name = model_name
+        self.system_prompt = system_prompt
+        self.result_type = result_type
+        self.max_entries = max_entries
+        self.expected_output_tokens = expected_output_tokens
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._schema: Optional[str] = None
+
+    @property
+    def agent(self):
+        if self._agent is None:
+            self._agent = self._build_agent()
+        return self._agent
+
+    @agent.setter
+    def agent(self, agent):
+        self._agent = agent
+
+    def cache_key(self, prompt: str) -> str:
+        if self._schema is None:
+            self._schema = json.dumps(TypeAdapter(self.result_type).json_schema(), sort_keys=True)
+        digest = hashlib.sha256()
+        for part in (self.model_name, self.system_prompt, normalize_prompt(prompt), self._schema):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def lookup(self, prompt: str) -> Optional[Any]:
+        key = self.cache_key(prompt)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            record_cache(f"llm.{self.name}", hit=True)
+            return self._entries[key]
+        self.misses += 1
+        record_cache(f"llm.{self.name}", hit=False)
+        return None
+
+    def store(self, prompt: str, output: Any, validate: Callable[[Any], bool] = is_usable) -> bool:
+        if not validate(output):
+            return False
+        key = self.cache_key(prompt)
+        self._entries[key] = output
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return True
+
+    def estimate_tokens(self, prompt: str) -> int:
+        return estimate_tokens(self.system_prompt) + estimate_tokens(prompt) + self.expected_output_tokens
+
+    async def run(self, prompt: str, refresh: bool = False, validate: Callable[[Any], bool] = is_usable, **kwargs):
+        if kwargs:
+            # They would change the output without changing the key
+            raise TypeError(f"CachedAgent.run does not take {sorted(kwargs)}; use .agent.run for uncached calls")
+        output = None if refresh else self.lookup(prompt)
+        if output is not None:
+            return CachedRunResult(output)
+
+        reserved = await rate_limit.llm_rate_limiter.acquire(self.estimate_tokens(prompt))
+        with span(f"llm.{self.name}", model=self.model_name):
+            result = await self.agent.run(prompt)
+        usage = result.usage()
+        rate_limit.llm_rate_limiter.settle(reserved, getattr(usage, "total_tokens", None))
+        record_usage(self.name, usage)
+        self.store(prompt, result.output, validate)
+        return result
+
+    async def stream_output(self, prompt: str, debounce_by: float = 0.1, refresh: bool = False,
+                            validate: Callable[[Any], bool] = is_usable):
+        """Yield partial outputs as the model streams them; the last one is final.
+
+        A cache hit yields the stored output once.
+        """
+        output = None if refresh else self.lookup(prompt)
+        if output is not None:
+            yield output
+            return
+
+        reserved = await rate_limit.llm_rate_limiter.acquire(self.estimate_tokens(prompt))
+        usage = None
+        try:
+            with span(f"llm.{self.name}", attach=False, model=self.model_name, streamed=True):
+                async with self.agent.run_stream(prompt) as result:
+                    try:
+                        async for partial in result.stream(debounce_by=debounce_by):
+                            yield partial
+                        output = await result.get_output()
+                    finally:
+                        # Also when the consumer abandons the stream part way
+                        usage = result.usage()
+        finally:
+            rate_limit.llm_rate_limiter.settle(reserved, getattr(usage, "total_tokens", None))
+            record_usage(self.name, usage)
+        self.store(prompt, output, validate)
+        yield output
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def __getattr__(self, name):
+        # Anything not cached (run_stream, iter, ...) goes straight to the agent
+        return getattr(self.agent, name)
@@ -1,13 +1,7 @@
-from pydantic_ai import Agent
 from pydantic import BaseModel, Field
 from typing import List
-from pydantic_ai.models.openai import OpenAIModel
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-
-model = OpenAIModel("gpt-4o-mini")
+from agents.llm_cache import CachedAgent
+from agents.registry import build_agent, PROFILE_MODEL
 
 class ProfileAnalyser(BaseModel):
     score: int = Field(description="Match score (0–100) between the user profile and job")
@@ -29,8 +23,11 @@ Compare the user's profile with the job description and return:
 Respond with a JSON object matching the defined format.
 """
 
-profile_analyser_agent = Agent(
-    model=model,
+# Built lazily by the registry the first time the agent is used
+profile_analyser_agent = CachedAgent(
+    lambda: build_agent(system_prompt, List[ProfileAnalyser], PROFILE_MODEL),
+    model_name=PROFILE_MODEL,
+    name="profile_analyser",
     system_prompt=system_prompt,
     result_type=List[ProfileAnalyser],
 )
\ No newline at end of file
@@ -0,0 +1,60 @@
+# File: agents/registry.py
+#
+# One place that builds the model client and the pydantic-ai agents, on first use.
+
+from functools import lru_cache
+from typing import Any
+from dotenv import load_dotenv
+import os
+
+load_dotenv()
+MODEL_NAME = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+
+# Per-agent models; each falls back to OPENAI_MODEL
+SCORE_MODEL = os.getenv("OPENAI_SCORE_MODEL", MODEL_NAME)
+DETAIL_MODEL = os.getenv("OPENAI_DETAIL_MODEL", MODEL_NAME)
+PROFILE_MODEL = os.getenv("OPENAI_PROFILE_MODEL", MODEL_NAME)
+CV_MODEL = os.getenv("OPENAI_CV_MODEL", MODEL_NAME)
+
+# Connection pool shared by every agent
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "50"))
+OPENAI_MAX_KEEPALIVE = int(os.getenv("OPENAI_MAX_KEEPALIVE", "20"))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "120"))
+
+
+@lru_cache(maxsize=None)
+def get_http_client():
+    """One pooled, keep-alive async HTTP client for all OpenAI traffic."""
+    import httpx
+    from Logic import rate_limit
+
+    async def observe_rate_limits(response):
+        rate_limit.llm_rate_limiter.observe_headers(response.status_code, response.headers)
+
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=OPENAI_MAX_CONNECTIONS, max_keepalive_connections=OPENAI_MAX_KEEPALIVE),
+        timeout=httpx.Timeout(OPENAI_TIMEOUT, connect=10.0),
+        event_hooks={"response": [observe_rate_limits]},
+    )
+
+
+@lru_cache(maxsize=None)
+def get_provider():
+    from pydantic_ai.providers.openai import OpenAIProvider
+    return OpenAIProvider(http_client=get_http_client())
+
+
+@lru_cache(maxsize=None)
+def get_model(model_name: str = MODEL_NAME):
+    """Shared OpenAIModel per model name; all of them sit on the same provider and pool."""
+    from pydantic_ai.models.openai import OpenAIModel
+    return OpenAIModel(model_name, provider=get_provider())
+
+
+def build_agent(system_prompt: str, result_type: Any, model_name: str = MODEL_NAME):
+    from pydantic_ai import Agent
+    return Agent(
+        model=get_model(model_name),
+        system_prompt=system_prompt,
+        result_type=result_type,
+    )
@@ -0,0 +1,231 @@
+# File: api.py
+#
+# HTTP service for driving the pipelines from other systems:
+#
+#   uvicorn api:app --host 0.0.0.0 --port 8000
+#
+# Submissions return a task ID straight away; poll GET /tasks/<id> or follow
+# GET /tasks/<id>/events (server-sent events) for progress and the result.
+#
+# With API_MOUNT_UI=1 the Gradio app is served from the same process at /ui.
+# Only then do API tasks (BATCH) and UI calls (INTERACTIVE) share one LLM
+# rate limiter, so the UI is served first; a separate app.py process has its
+# own budget.
+
+import os
+import json
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
+from sse_starlette.sse import EventSourceResponse
+from main import workflow
+from langgraph.cv_graph import cv_workflow, CVState
+from agents.profileanalyser import profile_analyser_agent
+from Logic.job_cache import get_or_cache_job
+from Logic.profile_store import profile_store, profile_to_text, DEFAULT_USER
+from Logic.prompts import build_profile_analysis_prompt
+from Logic.metrics import registry
+from Logic.history_store import history_store
+from Logic.task_queue import TaskQueue, QueueFull
+from Logic.cv_batch import generate_cvs
+
+API_HOST = os.getenv("API_HOST", "0.0.0.0")
+API_PORT = int(os.getenv("API_PORT", "8000"))
+API_MOUNT_UI = int(os.getenv("API_MOUNT_UI", "0"))
+
+
+# --- Request bodies ---
+class AnalysisRequest(BaseModel):
+    job_ids: List[str] = Field(..., min_length=1)
+    cv_text: str
+
+
+class ProfileAnalysisRequest(BaseModel):
+    job_id: str
+    user_id: str = DEFAULT_USER
+    profile: Optional[Dict[str, Any]] = Field(default=None, description="Inline profile; overrides the saved one")
+
+
+class CVGenerationRequest(BaseModel):
+    job_id: str
+    cv_text: str
+    user_id: str = DEFAULT_USER
+    profile: Optional[Dict[str, Any]] = Field(default=None, description="Inline profile; overrides the saved one")
+
+
+class CVBatchRequest(BaseModel):
+    job_ids: List[str] = Field(..., min_length=1)
+    cv_text: str
+    user_id: str = DEFAULT_USER
+    profile: Optional[Dict[str, Any]] = Field(default=None, description="Inline profile; overrides the saved one")
+
+
+def resolve_profile(user_id: str, profile: Optional[Dict[str, Any]]):
+    if profile is not None:
+        return profile, profile_to_text(profile)
+    stored = profile_store.get(user_id)
+    if stored is None:
+        raise ValueError(f"No saved profile for user '{user_id}'")
+    return stored.profile, stored.profile_text
+
+
+# --- Task handlers: run one pipeline, publishing progress through emit() ---
+async def run_analysis(payload: Dict[str, Any], emit) -> Dict[str, Any]:
+    state = {
+        "job_ids": payload["job_ids"],
+        "user_cv": payload["cv_text"],
+        "job_analysis": None,
+        "status": "start",
+        "errors": {},
+    }
+    result = state
+    async for mode, chunk in workflow.astream(state, stream_mode=["custom", "values"]):
+        if mode == "values":
+            result = chunk
+        else:
+            emit(chunk)
+    return {"job_analysis": result["job_analysis"], "errors": result["errors"]}
+
+
+async def run_profile_analysis(payload: Dict[str, Any], emit) -> Dict[str, Any]:
+    _, profile_text = resolve_profile(payload["user_id"], payload.get("profile"))
+    job = await get_or_cache_job(payload["job_id"])
+    if not job:
+        raise ValueError(f"Could not fetch job {payload['job_id']}")
+    emit({"stage": "job_loaded"})
+
+    result = await profile_analyser_agent.run(build_profile_analysis_prompt(job, profile_text))
+    output = result.output[0].model_dump()
+    history_store.record({
+        **output,
+        "job_id": str(payload["job_id"]),
+        "title": job["job_info"].get("title"),
+        "company": job["company_info"].get("name"),
+        "link": job["job_info"].get("job_url"),
+    }, source="profile_analyzer", user_id=payload["user_id"])
+    return output
+
+
+async def run_cv_generation(payload: Dict[str, Any], emit) -> Dict[str, Any]:
+    profile, profile_text = resolve_profile(payload["user_id"], payload.get("profile"))
+    state = CVState(
+        job_id=payload["job_id"],
+        profile=profile,
+        profile_text=profile_text,
+        job=None,
+        cv_text=payload["cv_text"],
+        original_cv=payload["cv_text"],
+        cv_suggestions=None,
+        final_cv=None,
+    )
+    result = state
+    async for mode, chunk in cv_workflow.astream(state, stream_mode=["updates", "values"]):
+        if mode == "values":
+            result = chunk
+        else:
+            emit({"stage": next(iter(chunk))})
+    return {"cv_suggestions": result["cv_suggestions"], "final_cv": result["final_cv"]}
+
+
+async def run_cv_batch(payload: Dict[str, Any], emit) -> Dict[str, Any]:
+    profile, profile_text = resolve_profile(payload["user_id"], payload.get("profile"))
+    cvs, errors = {}, {}
+    async for event in generate_cvs(payload["job_ids"], payload["cv_text"], profile, profile_text):
+        if event["status"] == "done":
+            cvs[event["job_id"]] = event["final_cv"]
+        elif event["status"] == "failed":
+            errors[event["job_id"]] = event["error"]
+        # Each finished CV is streamed in full; polling returns them all at the end
+        emit(event)
+    return {"cvs": cvs, "errors": errors}
+
+
+task_queue = TaskQueue()
+task_queue.register("analysis", run_analysis)
+task_queue.register("profile_analysis", run_profile_analysis)
+task_queue.register("cv_generation", run_cv_generation)
+task_queue.register("cv_batch", run_cv_batch)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await task_queue.start()
+    yield
+    await task_queue.stop()
+
+
+app = FastAPI(title="LinkedIn Job Analyser API", lifespan=lifespan)
+
+
+# --- Routes ---
+def submit(kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        task = task_queue.submit(kind, payload)
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=f"Queue is full: {e}")
+    return {"task_id": task.id, "status": task.status}
+
+
+@app.post("/analysis", status_code=202)
+async def submit_analysis(body: AnalysisRequest):
+    return submit("analysis", body.model_dump())
+
+
+@app.post("/profile-analysis", status_code=202)
+async def submit_profile_analysis(body: ProfileAnalysisRequest):
+    return submit("profile_analysis", body.model_dump())
+
+
+@app.post("/cv", status_code=202)
+async def submit_cv_generation(body: CVGenerationRequest):
+    return submit("cv_generation", body.model_dump())
+
+
+@app.post("/cv/batch", status_code=202)
+async def submit_cv_batch(body: CVBatchRequest):
+    return submit("cv_batch", body.model_dump())
+
+
+@app.get("/tasks/{task_id}")
+async def task_status(task_id: str):
+    task = task_queue.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired task")
+    return task.summary()
+
+
+@app.get("/tasks/{task_id}/events")
+async def task_events(task_id: str):
+    task = task_queue.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired task")
+
+    async def stream():
+        async for event in task_queue.events(task_id):
+            yield {"event": "progress", "data": json.dumps(event, default=str)}
+        yield {"event": "result", "data": json.dumps(task.summary(), default=str)}
+
+    return EventSourceResponse(stream())
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok", "queued": task_queue.depth()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+if API_MOUNT_UI:
+    import gradio as gr
+    from app import demo
+    app = gr.mount_gradio_app(app, demo, path="/ui")
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host=API_HOST, port=API_PORT)
@@ -2,26 +2,16 @@
 
 
 import gradio as gr
-from agents.jobextractor import get_job_details_by_id
-from agents.profileanalyser import profile_analyser_agent
-from agents.jobanalyser import job_analyser_agent
 from Ui.cv_analyzer_tab import cv_analyzer_tab
-from Ui.profile_tab import profile_ui
+from Ui.profile_tab import profile_ui, load_profile_fields
 from Ui.profile_analyzer_tab import profile_analyzer_ui
 from Ui.cv_maker_tab import cv_maker_tab
-import asyncio
-import fitz
-import json
+from Ui.history_tab import history_tab
+from Logic.metrics import start_metrics_server
 import os
-from typing import List
-
-
-shared_cv_text = gr.State()
-shared_job_id = gr.State()
-shared_job_info = gr.State()
-shared_cv_suggestions = gr.State()
-
 
+# Per-event limits live next to each handler; this caps everything else
+GRADIO_DEFAULT_CONCURRENCY = int(os.getenv("GRADIO_DEFAULT_CONCURRENCY", "16"))
 
 # --- Gradio UI ---
 with gr.Blocks(title="Job Fit Analyzer") as demo:
@@ -30,18 +20,28 @@ with gr.Blocks(title="Job Fit Analyzer") as demo:
 
     with gr.Tabs():
         with gr.Tab("👤 User Profile"):
-            profile_ui()
+            profile_fields = profile_ui()
 
         with gr.Tab(" Profile Analyzer"):
             profile_analyzer_ui()
         
         with gr.Tab(" CV Analyzer"):
-            cv_analyzer_tab(shared_cv_text, shared_job_id, shared_job_info, shared_cv_suggestions)
+            cv_analyzer_tab()
 
         with gr.Tab("🧾 Generate personalized  CV"):
-            cv_maker_tab(shared_cv_text, shared_job_id, shared_job_info, shared_cv_suggestions)
+            cv_maker_tab()
 
         with gr.Tab(" History / Export"):
-            gr.Markdown("📝 This section will let you save & compare results (coming soon).")
+            history_tab()
+
+    demo.load(fn=load_profile_fields, inputs=None, outputs=profile_fields)
+
+demo.queue(default_concurrency_limit=GRADIO_DEFAULT_CONCURRENCY)
 
-demo.launch()
+# api.py can also mount this UI in its own process (API_MOUNT_UI=1).
+# Startup stays under __main__: spawned PDF workers re-import this module.
+if __name__ == "__main__":
+    # Prometheus scrape endpoint, only when a port is configured
+    if os.getenv("METRICS_PORT"):
+        start_metrics_server(int(os.getenv("METRICS_PORT")))
+    demo.launch()
@@ -0,0 +1,169 @@
+# File: benchmarks/fakes.py
+#
+# Deterministic local stand-ins for the OpenAI-backed agents and the Apify actor.
+
+import asyncio
+import random
+import re
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+from agents.jobextractor import FakeBackend
+
+
+class FakeFailure(RuntimeError):
+    pass
+
+
+@dataclass
+class FakeUsage:
+    request_tokens: int
+    response_tokens: int
+
+    @property
+    def total_tokens(self) -> int:
+        return self.request_tokens + self.response_tokens
+
+
+@dataclass
+class FakeRunResult:
+    output: Any
+    _usage: FakeUsage
+
+    def usage(self) -> FakeUsage:
+        return self._usage
+
+
+class LatencyModel:
+    """latency ± jitter seconds, failing with probability failure_rate; seeded for repeatability."""
+
+    def __init__(self, latency: float = 0.2, jitter: float = 0.05, failure_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+
+    async def wait(self):
+        delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+        await asyncio.sleep(delay)
+        if self.random.random() < self.failure_rate:
+            raise FakeFailure("injected failure")
+
+
+class FakeAgent:
+    """Mimics the parts of a pydantic-ai Agent the app uses: run() and run_stream()."""
+
+    def __init__(self, make_output: Callable[[str], Any], latency: LatencyModel, stream_chunks: int = 5):
+        self.make_output = make_output
+        self.latency = latency
+        self.stream_chunks = stream_chunks
+        self.calls = 0
+
+    async def run(self, prompt: str, **kwargs) -> FakeRunResult:
+        self.calls += 1
+        await self.latency.wait()
+        output = self.make_output(prompt)
+        return FakeRunResult(output, FakeUsage(len(prompt) // 4, len(str(output)) // 4))
+
+    @asynccontextmanager
+    async def run_stream(self, prompt: str, **kwargs):
+        result = await self.run(prompt)
+        chunks = self.stream_chunks
+
+        class _Stream:
+            async def stream(self, debounce_by: Optional[float] = None):
+                for _ in range(chunks - 1):
+                    await asyncio.sleep(0)
+                    yield result.output
+                yield result.output
+
+            async def get_output(self):
+                return result.output
+
+            def usage(self):
+                return result.usage()
+
+        yield _Stream()
+
+
+class BenchmarkBackend(FakeBackend):
+    """FakeBackend with the same latency/jitter/failure model as the fake agents, per actor run."""
+
+    def __init__(self, jobs: Dict[str, Dict[str, Any]], latency: LatencyModel, per_item_latency: float = 0.0):
+        super().__init__(jobs, latency=per_item_latency)
+        self.run_latency = latency
+
+    async def run(self, job_ids: List[str]):
+        await self.run_latency.wait()
+        async for item in super().run(job_ids):
+            yield item
+
+
+# --- Output factories: plausible, deterministic results derived from the prompt ---
+def _score_for(text: str) -> int:
+    return sum(map(ord, text[-200:])) % 101
+
+
+def job_analyser_output(prompt: str):
+    from agents.jobanalyser import JobAnalyser
+    job_ids = re.findall(r"Job ID: (\S+) ---", prompt) or [None]
+    return [
+        JobAnalyser(
+            job_id=job_id,
+            score=_score_for(f"{job_id}{prompt[:200]}"),
+            summary="Synthetic summary for benchmarking.",
+            required_skills=["Python", "SQL", "Docker"],
+            matched_skills=["Python"],
+            missing_skills=["SQL", "Docker"],
+            cv_recommendations=["Mention SQL projects", "Add a Docker example"],
+        )
+        for job_id in job_ids
+    ]
+
+
+def job_scorer_output(prompt: str):
+    from agents.jobanalyser import JobScore
+    job_ids = re.findall(r"Job ID: (\S+) ---", prompt) or [None]
+    return [JobScore(job_id=job_id, score=_score_for(f"{job_id}{prompt[:200]}")) for job_id in job_ids]
+
+
+def profile_analyser_output(prompt: str):
+    from agents.profileanalyser import ProfileAnalyser
+    return [ProfileAnalyser(
+        score=_score_for(prompt),
+        summary="Synthetic summary for benchmarking.",
+        matched_elements=["Python"],
+        missing_elements=["Cloud experience"],
+        improvement_recommendations=["Add a cloud project"],
+    )]
+
+
+def cv_maker_output(prompt: str):
+    from agents.cv_maker import CVOutput
+    return CVOutput(cv="SYNTHETIC CV\n" + "Experience line\n" * 40)
+
+
+def install_fakes(jobs: Dict[str, Dict[str, Any]], llm_latency: LatencyModel, fetch_latency: LatencyModel) -> Dict[str, FakeAgent]:
+    """Point the shared agents and job fetcher at local fakes; returns the fake agents by name."""
+    from agents import jobanalyser, profileanalyser, cv_maker, jobextractor
+
+    fakes = {
+        "job_analyser": FakeAgent(job_analyser_output, llm_latency),
+        "job_scorer": FakeAgent(job_scorer_output, llm_latency),
+        "profile_analyser": FakeAgent(profile_analyser_output, llm_latency),
+        "cv_maker": FakeAgent(cv_maker_output, llm_latency),
+    }
+    # The caching wrappers stay in place; only the model call behind them is faked
+    jobanalyser.job_analyser_agent.agent = fakes["job_analyser"]
+    jobanalyser.job_scorer_agent.agent = fakes["job_scorer"]
+    profileanalyser.profile_analyser_agent.agent = fakes["profile_analyser"]
+    cv_maker.cv_maker_agent.agent = fakes["cv_maker"]
+
+    backend = BenchmarkBackend(jobs, fetch_latency)
+    jobextractor.set_backend(backend)
+
+    def get_job_details_by_id(job_ids: List[str]) -> List[Dict[str, Any]]:
+        return [jobs[job_id] for job_id in job_ids if job_id in jobs]
+    jobextractor.get_job_details_by_id = get_job_details_by_id
+
+    return fakes
@@ -0,0 +1,74 @@
+# File: benchmarks/fixtures.py
+#
+# Job postings shaped like the Apify actor output (job_info / company_info).
+
+import glob
+import json
+import os
+import random
+from typing import Any, Dict
+
+TITLES = ["Machine Learning Engineer", "Backend Developer", "Data Scientist", "3D Graphics Engineer",
+          "MLOps Engineer", "Computer Vision Researcher", "Python Developer", "Unity Developer"]
+COMPANIES = ["Acme AI", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries"]
+SKILLS = ["Python", "PyTorch", "TensorFlow", "Docker", "Kubernetes", "SQL", "AWS", "Blender",
+          "Unity", "C++", "HuggingFace", "FastAPI", "React", "Spark", "Airflow", "Go"]
+
+BOILERPLATE = (
+    "We are an equal opportunity employer and all qualified applicants will receive consideration "
+    "for employment without regard to race, color, religion, sex, sexual orientation, gender identity, "
+    "national origin, disability status or protected veteran status.\n\n"
+    "Benefits include health insurance, dental, 401(k) matching and paid time off."
+)
+
+SAMPLE_CV = """- 2 years experience with Python and PyTorch
+- Worked on multiple AI side-projects
+- Familiar with Blender, Unity, and 3D avatar models
+- Experience with Google Colab and HuggingFace for hosted model training"""
+
+SAMPLE_PROFILE = {
+    "name": "Benchmark User",
+    "university": "Example University",
+    "degree": "BSc Computer Science",
+    "courses": "Machine Learning, Computer Graphics",
+    "experience": ["ML intern at Example Corp", "Research assistant"],
+    "skills": "Python, PyTorch, Blender, Unity",
+    "projects": ["3D avatar generator", "Image classifier"],
+}
+
+
+def make_job(job_id: str, rng: random.Random) -> Dict[str, Any]:
+    skills = rng.sample(SKILLS, 5)
+    description = (
+        f"About the role\nWe are looking for a {rng.choice(TITLES)} to join our team.\n\n"
+        "Responsibilities\n" + "\n".join(f"- Build and maintain systems using {s}" for s in skills[:3]) + "\n\n"
+        "Requirements\n" + "\n".join(f"- {rng.randint(1, 5)}+ years with {s}" for s in skills) + "\n\n"
+        + BOILERPLATE
+    )
+    return {
+        "job_info": {
+            "title": rng.choice(TITLES),
+            "location": rng.choice(["Remote", "Berlin, Germany", "London, UK", "New York, NY"]),
+            "description": description,
+            "job_url": f"https://www.linkedin.com/jobs/view/{job_id}/",
+        },
+        "company_info": {"name": rng.choice(COMPANIES)},
+    }
+
+
+def make_jobs(count: int, seed: int = 0) -> Dict[str, Dict[str, Any]]:
+    rng = random.Random(seed)
+    return {str(4_000_000_000 + i): make_job(str(4_000_000_000 + i), rng) for i in range(count)}
+
+
+def load_jobs(directory: str) -> Dict[str, Dict[str, Any]]:
+    """Real postings saved as job_<id>.json (e.g. the legacy data/ cache), keyed by ID."""
+    jobs = {}
+    for path in glob.glob(os.path.join(directory, "job_*.json")):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                job = json.load(f)
+        except ValueError:
+            continue
+        jobs[os.path.basename(path)[len("job_"):-len(".json")]] = job
+    return jobs
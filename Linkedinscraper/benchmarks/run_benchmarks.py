@@ -0,0 +1,286 @@
+# File: benchmarks/run_benchmarks.py
+#
+# Offline throughput/latency benchmarks with fake LLM and Apify backends.
+# Run from the Linkedinscraper directory:
+#
+#   python -m benchmarks.run_benchmarks --batch-sizes 10,50 --concurrency 1,5,20
+#   python -m benchmarks.run_benchmarks --baseline bench_before.json --output bench_after.json
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+# The real clients refuse to build without credentials; nothing is sent anywhere
+os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+os.environ.setdefault("APIFY_API_TOKEN", "offline-benchmark")
+
+from benchmarks.fakes import LatencyModel, install_fakes
+from benchmarks.fixtures import SAMPLE_CV, SAMPLE_PROFILE, make_jobs, load_jobs
+
+SCENARIOS = ["analysis_workflow", "cv_graph", "profile_analyzer_handler", "cv_maker_handler"]
+
+
+def percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    # Nearest-rank percentile
+    index = min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+# --- Per-run isolation: fresh job cache, empty LLM caches, temp profile store ---
+def reset_state(work_dir: str):
+    from Logic import job_cache, dedup, rate_limit
+    from Logic.profile_store import profile_store
+    from Logic.history_store import history_store
+    from agents.jobanalyser import job_analyser_agent, job_scorer_agent
+    from agents.profileanalyser import profile_analyser_agent
+    from agents.cv_maker import cv_maker_agent
+
+    for agent in (job_analyser_agent, job_scorer_agent, profile_analyser_agent, cv_maker_agent):
+        agent.clear()
+    # Fake agents cost nothing; a real budget would throttle later scenarios and make results order-dependent
+    rate_limit.set_rate_limiter(rate_limit.RateLimiter(rpm=math.inf, tpm=math.inf))
+
+    cache_dir = tempfile.mkdtemp(dir=work_dir)
+    dedup._indexes["data"] = dedup.DuplicateIndex(cache_dir)
+    dedup.analysis_reuse.clear()
+    job_cache._caches.clear()
+    job_cache._caches["data"] = job_cache.JobCache(cache_dir)
+
+    profile_store.data_dir = work_dir
+    history_store.path = os.path.join(cache_dir, "history.sqlite")
+    history_store._db = None
+    profile_store.save(SAMPLE_PROFILE)
+
+
+async def bounded(items: List[Any], concurrency: int, unit: Callable) -> Tuple[List[float], int]:
+    """Run unit(item) with a concurrency cap; returns per-item latencies and the failure count."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, failures = [], 0
+
+    async def timed(item):
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await unit(item)
+            except Exception:
+                failures += 1
+                return
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(timed(item) for item in items))
+    return latencies, failures
+
+
+# --- Scenarios: each returns (latency samples in seconds, failures) ---
+async def analysis_workflow(job_ids: List[str], concurrency: int) -> Tuple[List[float], int]:
+    import main
+    from Logic import job_analysis
+    from Logic.dedup import analysis_reuse
+
+    # Latency per job = time from workflow start until that job's result exists.
+    # Cascade stops and reposts sharing an analysis never reach to_result, so they are timed too.
+    start = time.perf_counter()
+    latencies: List[float] = []
+    originals = {"to_result": job_analysis.to_result, "to_score_result": job_analysis.to_score_result,
+                 "reuse": analysis_reuse.reuse}
+
+    def recording(make_result):
+        def wrapper(*args):
+            latencies.append(time.perf_counter() - start)
+            return make_result(*args)
+        return wrapper
+
+    main.ANALYSIS_CONCURRENCY = concurrency
+    job_analysis.to_result = recording(originals["to_result"])
+    job_analysis.to_score_result = recording(originals["to_score_result"])
+    analysis_reuse.reuse = recording(originals["reuse"])
+    try:
+        state = {**main.initial_state, "job_ids": job_ids, "user_cv": SAMPLE_CV}
+        result = await main.workflow.ainvoke(state)
+    finally:
+        job_analysis.to_result = originals["to_result"]
+        job_analysis.to_score_result = originals["to_score_result"]
+        analysis_reuse.reuse = originals["reuse"]
+    failures = len(result["errors"])
+    return latencies, failures
+
+
+async def cv_graph(job_ids: List[str], concurrency: int) -> Tuple[List[float], int]:
+    from langgraph.cv_graph import cv_workflow, CVState
+
+    async def unit(job_id):
+        await cv_workflow.ainvoke(CVState(
+            job_id=job_id, profile=SAMPLE_PROFILE, profile_text=None, job=None,
+            cv_text=SAMPLE_CV, original_cv=SAMPLE_CV, cv_suggestions=None, final_cv=None,
+        ))
+
+    return await bounded(job_ids, concurrency, unit)
+
+
+async def profile_analyzer_handler(job_ids: List[str], concurrency: int) -> Tuple[List[float], int]:
+    from Ui.profile_analyzer_tab import analyze_profile_fit
+    from Logic.profile_store import DEFAULT_USER
+
+    async def unit(job_id):
+        await analyze_profile_fit(job_id, DEFAULT_USER)
+
+    return await bounded(job_ids, concurrency, unit)
+
+
+async def cv_maker_handler(job_ids: List[str], concurrency: int) -> Tuple[List[float], int]:
+    from Ui.cv_maker_tab import run_cv_generation
+    from Logic.job_cache import get_or_cache_jobs
+    from Logic.profile_store import DEFAULT_USER
+    from Logic.session_store import session_store
+
+    # Each simulated user has already analyzed their CV against one job
+    jobs = await get_or_cache_jobs(job_ids)
+    for job_id in job_ids:
+        session_store.update(
+            f"bench-{job_id}", cv_text=SAMPLE_CV, job_id=job_id, job_info=jobs[job_id],
+            cv_suggestions={"summary": "s", "score": 50, "required_skills": ["Python"],
+                            "matched_skills": ["Python"], "missing_skills": [], "cv_recommendations": []},
+        )
+
+    async def unit(job_id):
+        async for _ in run_cv_generation(f"bench-{job_id}", DEFAULT_USER):
+            pass
+
+    return await bounded(job_ids, concurrency, unit)
+
+
+async def run_scenario(name: str, job_ids: List[str], concurrency: int, work_dir: str) -> Dict[str, Any]:
+    reset_state(work_dir)
+    scenario = globals()[name]
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    latencies, failures = await scenario(job_ids, concurrency)
+    wall = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "scenario": name,
+        "batch_size": len(job_ids),
+        "concurrency": concurrency,
+        "completed": len(latencies),
+        "failures": failures,
+        "wall_s": round(wall, 4),
+        "jobs_per_s": round(len(latencies) / wall, 3) if wall else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "peak_mem_kb": round(peak / 1024, 1),
+    }
+
+
+# --- Regression check against an earlier results file ---
+def compare(results: List[Dict[str, Any]], baseline_path: str, threshold: float) -> bool:
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["scenario"], r["batch_size"], r["concurrency"]): r for r in json.load(f)["results"]}
+
+    ok = True
+    print(f"\n Compared with {baseline_path} (regression threshold {threshold:.0%}):")
+    for r in results:
+        before = baseline.get((r["scenario"], r["batch_size"], r["concurrency"]))
+        if before is None:
+            continue
+        p95_change = (r["p95_ms"] - before["p95_ms"]) / before["p95_ms"] if before["p95_ms"] else 0.0
+        tput_change = (r["jobs_per_s"] - before["jobs_per_s"]) / before["jobs_per_s"] if before["jobs_per_s"] else 0.0
+        regressed = p95_change > threshold or tput_change < -threshold
+        ok = ok and not regressed
+        flag = "REGRESSION" if regressed else "ok"
+        print(f"  {r['scenario']:<26} n={r['batch_size']:<5} c={r['concurrency']:<4} "
+              f"p95 {p95_change:+.1%}  jobs/s {tput_change:+.1%}  {flag}")
+    return ok
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def parse_args():
+    ints = lambda value: [int(v) for v in value.split(",")]
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the analysis and CV pipelines.")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"comma-separated subset of {SCENARIOS}")
+    parser.add_argument("--batch-sizes", type=ints, default=[10, 50, 200])
+    parser.add_argument("--concurrency", type=ints, default=[1, 5, 20])
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="seconds per fake LLM call")
+    parser.add_argument("--llm-jitter", type=float, default=0.05)
+    parser.add_argument("--fetch-latency", type=float, default=1.0, help="seconds per fake actor run")
+    parser.add_argument("--fetch-jitter", type=float, default=0.2)
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="probability a fake LLM call fails")
+    parser.add_argument("--retry-backoff", type=float, default=0.01, help="overrides ANALYSIS_RETRY_BACKOFF")
+    parser.add_argument("--fixtures", help="directory of job_<id>.json files to use before synthetic jobs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative change counted as a regression")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        sys.exit(f" Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    jobs = load_jobs(args.fixtures) if args.fixtures else {}
+    jobs.update(make_jobs(max(args.batch_sizes), seed=args.seed))
+    job_ids = list(jobs)
+
+    llm_latency = LatencyModel(args.llm_latency, args.llm_jitter, args.failure_rate, seed=args.seed)
+    fetch_latency = LatencyModel(args.fetch_latency, args.fetch_jitter, seed=args.seed + 1)
+    install_fakes(jobs, llm_latency, fetch_latency)
+
+    from Logic import job_analysis
+    job_analysis.ANALYSIS_RETRY_BACKOFF = args.retry_backoff
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for name in scenarios:
+            for batch_size in args.batch_sizes:
+                for concurrency in args.concurrency:
+                    result = await run_scenario(name, job_ids[:batch_size], concurrency, work_dir)
+                    results.append(result)
+                    print(f" {name:<26} n={batch_size:<5} c={concurrency:<4} "
+                          f"{result['jobs_per_s']:>8.2f} jobs/s  p50 {result['p50_ms']:>8.1f} ms  "
+                          f"p95 {result['p95_ms']:>8.1f} ms  p99 {result['p99_ms']:>8.1f} ms  "
+                          f"peak {result['peak_mem_kb']:>9.1f} KB  failed {result['failures']}")
+
+    report = {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "settings": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")},
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n Results written to {args.output}")
+
+    if args.baseline and not compare(results, args.baseline, args.threshold):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,57 @@
+# generate_cvs.py
+#
+# Generate a tailored CV for every job in a shortlist, several at a time.
+#
+#   python generate_cvs.py --cv my_cv.pdf --jobs shortlist.txt --output-dir tailored_cvs
+#   head -20 job_ids.txt | python generate_cvs.py --cv my_cv.pdf --profile alice
+
+import argparse
+import asyncio
+import sys
+from Logic.cv_batch import generate_cvs, CV_BATCH_CONCURRENCY
+from Logic.job_ranker import read_job_ids
+from Logic.pdf_text import load_cv_text
+from Logic.profile_store import profile_store
+from Logic.rate_limit import priority, BATCH
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate tailored CVs for a list of LinkedIn jobs.")
+    parser.add_argument("--cv", required=True, help="original CV as a PDF or plain-text file")
+    parser.add_argument("--profile", default="default", metavar="USER_ID", help="saved profile to use")
+    parser.add_argument("--jobs", help="file with one job ID per line (default: stdin)")
+    parser.add_argument("--output-dir", default="tailored_cvs", help="one cv_<job_id>.md per job")
+    parser.add_argument("--concurrency", type=int, default=CV_BATCH_CONCURRENCY)
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    stored = profile_store.get(args.profile)
+    if stored is None:
+        sys.exit(f" No saved profile for user '{args.profile}'.")
+    cv_text = await load_cv_text(args.cv)
+
+    if args.jobs:
+        with open(args.jobs, "r", encoding="utf-8") as f:
+            job_ids = read_job_ids(f)
+    else:
+        job_ids = read_job_ids(sys.stdin)
+
+    failed = 0
+    with priority(BATCH):
+        async for event in generate_cvs(job_ids, cv_text, stored.profile, stored.profile_text,
+                                        output_dir=args.output_dir, concurrency=args.concurrency):
+            progress = f"[{event['completed']}/{event['total']}]"
+            if event["status"] == "started":
+                print(f" {progress} Generating CV for job {event['job_id']}...")
+            elif event["status"] == "done":
+                print(f" {progress} {event['title']} at {event['company']} (score {event['score']}) → {event['path']}")
+            else:
+                failed += 1
+                print(f" ****** {progress} Job {event['job_id']} failed: {event['error']}")
+
+    print(f"\n Wrote {len(job_ids) - failed} CVs to {args.output_dir}" + (f", {failed} failed" if failed else ""))
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,13 +1,17 @@
 from typing import TypedDict, Optional, Dict, Any
-from langgraph.graph import StateGraph, START, END
+from langgraph.graph import StateGraph, START
+from langgraph.config import get_stream_writer
 from Logic.job_cache import get_or_cache_job
 from agents.jobanalyser import job_analyser_agent
 from agents.cv_maker import cv_maker_agent
+from Logic.prompts import build_cv_analysis_prompt, build_cv_generation_prompt
+from Logic.metrics import timed
 
 # Step 1: Define the flow state (shared between all nodes)
 class CVState(TypedDict):
     job_id: str
     profile: Dict[str, Any]
+    profile_text: Optional[str]   # pre-rendered profile, reused across runs
     job: Optional[Dict[str, Any]]
     cv_text: Optional[str]
     cv_suggestions: Optional[Dict[str, Any]]
@@ -17,96 +21,81 @@ class CVState(TypedDict):
 # Step 2: Define node functions
 
 # --- Node 1: Load job from cache or API ---
+@timed("node.load_job")
 async def load_job_node(state: CVState) -> CVState:
-    job = get_or_cache_job(state["job_id"])
+    job = await get_or_cache_job(state["job_id"])
     return {**state, "job": job}
 
 # --- Node 2: Analyze the original CV ---
+@timed("node.analyze_cv")
 async def analyze_cv_node(state: CVState) -> CVState:
-    job = state["job"]
-    cv_text = state["cv_text"]
-
-    job_text = f"""
-Job Title: {job['job_info']['title']}
-Company: {job['company_info']['name']}
-Description: {job['job_info']['description']}
-"""
-
-    prompt = f"""
-Compare this job with the following user CV.
-
-=== Job Description ===
-{job_text}
+    prompt = build_cv_analysis_prompt(state["job"], state["cv_text"])
 
-=== User CV ===
-{cv_text}
+    # Partial analyses go to stream_mode="custom" listeners; no-op under ainvoke
+    writer = get_stream_writer()
+    output = None
+    async for partial in job_analyser_agent.stream_output(prompt):
+        if partial:
+            output = partial[0]
+            writer({"analysis": output})
 
-Return structured suggestions:
-- summary
-- score
-- required_skills
-- matched_skills
-- missing_skills
-- cv_recommendations
-"""
+    if output is None:
+        # Same message as the CV analyzer tab; cv_batch and the API report it as a failed job
+        raise ValueError("The analysis came back empty. Please try again.")
 
-    result = await job_analyser_agent.run(prompt)
     suggestions = {
-        "summary": result.output[0].summary,
-        "score": result.output[0].score,
-        "required_skills": result.output[0].required_skills,
-        "matched_skills": result.output[0].matched_skills,
-        "missing_skills": result.output[0].missing_skills,
-        "cv_recommendations": result.output[0].cv_recommendations,
+        "summary": output.summary,
+        "score": output.score,
+        "required_skills": output.required_skills,
+        "matched_skills": output.matched_skills,
+        "missing_skills": output.missing_skills,
+        "cv_recommendations": output.cv_recommendations,
     }
 
     return {**state, "cv_suggestions": suggestions}
 
 # --- Node 3: Generate the final CV using all inputs ---
+@timed("node.generate_cv")
 async def generate_cv_node(state: CVState) -> CVState:
-    profile = state["profile"]
+    profile = state.get("profile_text") or state["profile"]
     job = state["job"]
     suggestions = state["cv_suggestions"]
     original_cv = state["original_cv"]
 
-    job_text = job["job_info"]["description"]
+    prompt = build_cv_generation_prompt(job, original_cv, profile, suggestions)
 
-    prompt = f"""
-You are a professional resume writer.
+    writer = get_stream_writer()
+    final_cv = ""
+    async for partial in cv_maker_agent.stream_output(prompt):
+        final_cv = partial.cv
+        writer({"final_cv": final_cv})
 
-Here is the job description:
-{job_text}
+    return {**state, "final_cv": final_cv}
 
-Here is the user's original CV (you may reuse strong content):
-{original_cv}
+# Step 3: Route around nodes whose outputs are already in the state
+def route_from_start(state: CVState) -> str:
+    if not state.get("job"):
+        return "LoadJob"
+    return route_after_job(state)
 
-Here is the user's structured profile:
-{profile}
+def route_after_job(state: CVState) -> str:
+    if state.get("cv_suggestions"):
+        return "GenerateCV"
+    return "AnalyzeCV"
 
-Here are the CV suggestions (missing skills, recommendations):
-{suggestions}
-
-🎯 Your task:
-- Reuse relevant content from the original CV
-- Add any missing skills or projects from the profile
-- Make the CV tailored to the job
-- Follow ATS-friendly formatting
-- Output in plain text: Name, Contact, Summary, Education, Skills, Projects, Experience
-"""
-
-    result = await cv_maker_agent.run(prompt)
-    return {**state, "final_cv": result.output.cv}
-
-# Step 3: Build and compile the LangGraph
+# Step 4: Build and compile the LangGraph
 def build_cv_graph():
     graph = StateGraph(CVState)
     graph.add_node("LoadJob", load_job_node)
     graph.add_node("AnalyzeCV", analyze_cv_node)
     graph.add_node("GenerateCV", generate_cv_node)
 
-    graph.set_entry_point("LoadJob")
-    graph.add_edge("LoadJob", "AnalyzeCV")
+    graph.add_conditional_edges(START, route_from_start, ["LoadJob", "AnalyzeCV", "GenerateCV"])
+    graph.add_conditional_edges("LoadJob", route_after_job, ["AnalyzeCV", "GenerateCV"])
     graph.add_edge("AnalyzeCV", "GenerateCV")
     graph.set_finish_point("GenerateCV")
 
     return graph.compile()
+
+# Compiled once at import and shared by every caller
+cv_workflow = build_cv_graph()
@@ -1,72 +1,55 @@
 from typing import TypedDict, List, Dict, Any, Optional
-from agents.jobextractor import get_job_details_by_id  # renamed from jobextractor
-from agents.jobanalyser import job_analyser_agent
+from Logic.job_analysis import ANALYSIS_CONCURRENCY
+from Logic.pipeline import fetch_and_analyze
+from Logic.dedup import analysis_reuse
+from Logic.history_store import history_store
+from Logic.prompts import compaction_stats
+from Logic.metrics import timed
+from Logic.rate_limit import priority, BATCH
 from langgraph.graph import StateGraph, START, END
+from langgraph.config import get_stream_writer
 import asyncio
 
 class AgentState(TypedDict):
     job_ids: List[str]
     user_cv: str
-    job_details: Optional[List[Dict[str, Any]]]
     job_analysis: Optional[List[Dict[str, Any]]]
     status: str
-    error: Optional[str]
+    errors: Dict[str, str]  # job ID -> why it has no analysis
 
-# --- Node 1: Fetch job details by job ID ---
-async def fetch_by_job_id(state: AgentState) -> AgentState:
-    jobs = get_job_details_by_id(state["job_ids"])
-    return {**state, "job_details": jobs, "status": "job_details_fetched"}
-
-# --- Node 2: Analyze each job against CV ---
-async def analyze(state: AgentState) -> AgentState:
+# --- Node: fetch and analyze as one pipeline ---
+# Jobs are analyzed as soon as their dataset item arrives instead of after the
+# whole fetch, so wall time is roughly max(fetch, analyze) rather than their sum.
+@timed("node.fetch_and_analyze")
+async def fetch_and_analyze_jobs(state: AgentState) -> AgentState:
+    writer = get_stream_writer()
+    position = {str(job_id): i for i, job_id in enumerate(state["job_ids"])}
     job_analysis = []
+    errors: Dict[str, str] = {}
 
-    for job in state["job_details"]:
-        job_text = f"""
-        Job Title: {job['job_info']['title']}
-        Company: {job['company_info']['name']}
-        Location: {job['job_info'].get('location', 'N/A')}
-        Description: {job['job_info']['description']}
-        """
-
-        full_input = f"""
-Compare the following job with the user's CV.
-
-=== Job Posting ===
-{job_text}
-
-=== User CV ===
-{state['user_cv']}
-
-Return a JSON with:
-- summary (summary of the job)
-- score (0–100 confidence score on match)
-- required_skills (from the job)
-- cv_recommendations (what the user should change/add to their CV)
-        """
-
-        result = await job_analyser_agent.run(full_input)
-
-        job_analysis.append({
-            "job_id": job['job_info']['job_url'].split('/')[-2],
-            "title": job['job_info']['title'],
-            "company": job['company_info']['name'],
-            "score": result.output[0].score,
-            "summary": result.output[0].summary,
-            "required_skills": result.output[0].required_skills,
-            "cv_recommendations": result.output[0].cv_recommendations,
-            "link": job['job_info']['job_url']
-        })
+    async for result in fetch_and_analyze(state["job_ids"], state["user_cv"], ANALYSIS_CONCURRENCY):
+        # Partial results for astream(stream_mode="custom") consumers
+        writer({"job_analysis": result})
+        if "error" in result:
+            errors[result["job_id"]] = result["error"]
+        else:
+            job_analysis.append(result)
 
-    return {**state, "job_analysis": job_analysis, "status": "analysis_done"}
+    # Completion order varies run to run; keep the final state in input order
+    job_analysis.sort(key=lambda r: position.get(r.get("job_id"), len(position)))
+    history_store.record_many(job_analysis, source="batch")
+    return {
+        **state,
+        "job_analysis": job_analysis,
+        "status": "analysis_done",
+        "errors": {**(state.get("errors") or {}), **errors},
+    }
 
 # --- LangGraph setup ---
 builder = StateGraph(AgentState)
-builder.add_node("Fetch Job Details", fetch_by_job_id)
-builder.add_node("Analyze Job Fit", analyze)
-builder.add_edge(START, "Fetch Job Details")
-builder.add_edge("Fetch Job Details", "Analyze Job Fit")
-builder.add_edge("Analyze Job Fit", END)
+builder.add_node("Fetch and Analyze Jobs", fetch_and_analyze_jobs)
+builder.add_edge(START, "Fetch and Analyze Jobs")
+builder.add_edge("Fetch and Analyze Jobs", END)
 workflow = builder.compile()
 
 # --- Initial input (update this with user-provided job IDs and CV) ---
@@ -76,21 +59,35 @@ initial_state = AgentState(
 - Worked on multiple AI side-projects
 - Familiar with Blender, Unity, and 3D avatar models
 - Experience with Google Colab and HuggingFace for hosted model training""",
-    job_details=None,
     job_analysis=None,
     status="start",
-    error=None
+    errors={}
 )
 
 async def main():
-    result = await workflow.ainvoke(initial_state)
+    # Batch run: interactive requests sharing the limiter go first
+    with priority(BATCH):
+        result = initial_state
+        async for mode, chunk in workflow.astream(initial_state, stream_mode=["custom", "values"]):
+            if mode == "values":
+                result = chunk
+            elif "error" in chunk["job_analysis"]:
+                print(f" ****** Error analyzing job {chunk['job_analysis']['job_id']}")
+            else:
+                print(f" Analyzed job {chunk['job_analysis']['job_id']} — Score: {chunk['job_analysis']['score']}")
     print("\n📊 Final Analysis Results:\n")
     for job in result["job_analysis"]:
         print(f"{job['title']} at {job['company']} — Score: {job['score']}")
+        if job.get("tier") == "score":
+            # Stopped after the cascade's score-only pass
+            print(f"Link: {job['link']}\n")
+            continue
         print(f"Summary: {job['summary']}")
         print(f"Skills: {', '.join(job['required_skills'])}")
         print(f"CV Suggestions: {job['cv_recommendations']}")
         print(f"Link: {job['link']}\n")
+    print(f"LLM calls saved on reposted jobs: {analysis_reuse.saved_calls}")
+    print(f"Prompt tokens (est.): {compaction_stats['tokens_before']} raw → {compaction_stats['tokens_after']} after compaction")
 
 if __name__ == "__main__":
     asyncio.run(main())
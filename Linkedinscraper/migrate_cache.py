@@ -0,0 +1,41 @@
+# migrate_cache.py
+#
+# Move old data/job_<id>.json files into the compressed job cache.
+#
+#   python migrate_cache.py                 # import, train the dictionary, recompress
+#   python migrate_cache.py --remove-json   # ...and delete the imported JSON files
+
+import argparse
+import os
+from Logic.job_cache import get_job_cache
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Import legacy job JSON files into the compressed job cache.")
+    parser.add_argument("--cache-dir", default="data")
+    parser.add_argument("--remove-json", action="store_true", help="delete each JSON file once it is in the store")
+    parser.add_argument("--samples", type=int, default=2000, help="jobs sampled to train the zstd dictionary")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    cache = get_job_cache(args.cache_dir)
+    database = os.path.join(args.cache_dir, "job_cache.sqlite")
+
+    legacy_bytes = sum(os.path.getsize(os.path.join(args.cache_dir, f"job_{job_id}.json"))
+                       for job_id in cache.legacy_job_ids())
+    imported = cache.migrate_legacy(remove=args.remove_json)
+    print(f" Imported {imported} job files ({legacy_bytes / 1024:.0f} KB of JSON)")
+
+    if len(cache.job_ids()) < 100:
+        print(" Too few cached jobs to train a useful dictionary; rows stay plain zstd for now")
+    else:
+        dict_id = cache.train_dictionary(args.samples)
+        rewritten = cache.recompress()
+        cache.db.execute("VACUUM")
+        print(f" Trained dictionary {dict_id}, recompressed {rewritten} rows")
+    print(f" Job cache is now {os.path.getsize(database) / 1024:.0f} KB")
+
+if __name__ == "__main__":
+    main()
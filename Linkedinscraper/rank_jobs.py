@@ -0,0 +1,69 @@
+# rank_jobs.py
+#
+# Score one CV (or the saved user profile) against a large list of job IDs.
+#
+#   python rank_jobs.py --cv my_cv.pdf --jobs job_ids.txt --output ranked.jsonl
+#   cat job_ids.txt | python rank_jobs.py --profile --output ranked.csv
+#   python rank_jobs.py --cv my_cv.pdf --from-cache 200   # shortlist from already-scraped jobs
+
+import argparse
+import asyncio
+import sys
+from Logic.job_analysis import ANALYSIS_CONCURRENCY, ANALYSIS_BATCH_SIZE
+from Logic.profile_store import profile_store
+from Logic.job_ranker import read_job_ids, rank_to_file
+from Logic.job_index import jobs_matching_cv
+from Logic.pdf_text import load_cv_text
+from Logic.rate_limit import priority, BATCH
+
+
+def load_profile_text(user_id: str) -> str:
+    stored = profile_store.get(user_id)
+    if stored is None:
+        sys.exit(f" No saved profile for user '{user_id}'.")
+    return stored.profile_text
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Rank LinkedIn jobs against a CV or the saved profile.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--cv", help="CV as a PDF or plain-text file")
+    source.add_argument("--profile", nargs="?", const="default", metavar="USER_ID",
+                        help="use a saved profile instead of a CV (default user: data/user_profile.json)")
+    jobs = parser.add_mutually_exclusive_group()
+    jobs.add_argument("--jobs", help="file with one job ID per line (default: stdin)")
+    jobs.add_argument("--from-cache", type=int, metavar="N",
+                      help="rank the N cached jobs most similar to the CV instead of a job ID list")
+    parser.add_argument("--output", default="ranked_jobs.jsonl", help=".jsonl or .csv; existing rows are skipped on rerun")
+    parser.add_argument("--concurrency", type=int, default=ANALYSIS_CONCURRENCY)
+    parser.add_argument("--batch-size", type=int, default=ANALYSIS_BATCH_SIZE, help="jobs packed into one LLM request")
+    parser.add_argument("--prefilter-top-k", type=int, help="only send the K best local BM25 matches to the LLM")
+    parser.add_argument("--min-prescore", type=float, help="only send jobs with a BM25 pre-score at or above this to the LLM")
+    parser.add_argument("--top", type=int, default=10, help="how many top matches to print at the end")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    user_cv = await load_cv_text(args.cv) if args.cv else load_profile_text(args.profile)
+
+    if args.from_cache:
+        job_ids = [job_id for job_id, _ in jobs_matching_cv(user_cv, args.from_cache)]
+        print(f" Shortlisted {len(job_ids)} cached jobs by local similarity")
+    elif args.jobs:
+        with open(args.jobs, "r", encoding="utf-8") as f:
+            job_ids = read_job_ids(f)
+    else:
+        job_ids = read_job_ids(sys.stdin)
+
+    with priority(BATCH):
+        ranked = await rank_to_file(job_ids, user_cv, args.output, concurrency=args.concurrency,
+                                    top_k=args.prefilter_top_k, min_prescore=args.min_prescore,
+                                    batch_size=args.batch_size)
+
+    print(f"\n📊 Top {min(args.top, len(ranked))} matches from this run:\n")
+    for job in ranked[:args.top]:
+        print(f"{job['score']:>3}  {job['title']} at {job['company']} — {job['link']}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
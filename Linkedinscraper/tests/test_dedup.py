@@ -0,0 +1,49 @@
+# Run from Linkedinscraper/: python -m pytest -q tests
+
+import asyncio
+
+from Logic.dedup import AnalysisReuse, DuplicateIndex
+
+DESCRIPTION = (
+    "We are looking for a data engineer to design and run batch and streaming pipelines on AWS. "
+    "You will own our Airflow deployment, model warehouse tables in dbt and work closely with "
+    "analysts and product managers to ship reliable datasets every week."
+)
+
+
+def make_job(job_id, title="Data Engineer", company="Acme", description=DESCRIPTION):
+    return {"job_info": {"job_id": job_id, "title": title, "description": description,
+                         "job_url": f"https://www.linkedin.com/jobs/view/{job_id}"},
+            "company_info": {"name": company}}
+
+
+def test_reposts_share_a_canonical_id(tmp_path):
+    index = DuplicateIndex(str(tmp_path))
+    assert index.add("1", make_job("1")) == "1"
+    assert index.add("2", make_job("2", description=DESCRIPTION + " Apply now.")) == "1"
+
+
+def test_empty_descriptions_are_not_duplicates(tmp_path):
+    index = DuplicateIndex(str(tmp_path))
+    assert index.add("1", make_job("1", title="Data Engineer", description="")) == "1"
+    assert index.add("2", make_job("2", title="Sales Manager", description="")) == "2"
+    assert index.add("3", make_job("3", title="Data Engineer", description=None)) == "3"
+
+
+def test_signatures_survive_a_restart_and_removal(tmp_path):
+    index = DuplicateIndex(str(tmp_path))
+    index.add("1", make_job("1"))
+    index.add("2", make_job("2"))
+    reopened = DuplicateIndex(str(tmp_path))
+    assert reopened.groups() == {"1": ["1", "2"]}
+    reopened.remove(["2"])
+    assert len(DuplicateIndex(str(tmp_path))) == 1
+
+
+def test_analysis_reuse_keys_use_the_given_index(tmp_path):
+    index = DuplicateIndex(str(tmp_path))
+    reuse = AnalysisReuse()
+    first = asyncio.run(reuse.key(make_job("1"), "cv", index))
+    second = asyncio.run(reuse.key(make_job("2"), "cv", index))
+    assert first == second and first[0] == "1"
+    assert len(index) == 2
@@ -0,0 +1,48 @@
+# Run from Linkedinscraper/: python -m pytest -q tests
+
+import csv
+
+from Logic.history_store import HistoryFilter, HistoryStore
+
+
+def make_result(i, skills=("Python",)):
+    return {"job_id": str(i), "title": f"Engineer {i}", "company": "Acme" if i % 2 else "Globex",
+            "score": i * 10, "summary": f"Fit {i}", "required_skills": list(skills),
+            "cv_recommendations": ["Add metrics"], "link": f"https://www.linkedin.com/jobs/view/{i}"}
+
+
+def filled_store(tmp_path) -> HistoryStore:
+    store = HistoryStore(str(tmp_path / "history.sqlite"))
+    store.record_many([make_result(i, ("Python", "SQL") if i < 3 else ("Unity",)) for i in range(1, 8)], "batch")
+    return store
+
+
+def test_pages_walk_every_entry_newest_first(tmp_path):
+    store = filled_store(tmp_path)
+    seen, cursor = [], None
+    while True:
+        entries, cursor = store.page(limit=3, before=cursor)
+        seen += [entry["job_id"] for entry in entries]
+        if cursor is None:
+            break
+    assert seen == [str(i) for i in range(7, 0, -1)]
+
+
+def test_filters_top_and_compare(tmp_path):
+    store = filled_store(tmp_path)
+    assert store.count(HistoryFilter(skill=" sql ")) == 2
+    assert store.count(HistoryFilter(company="acme", min_score=30)) == 3
+    assert [entry["job_id"] for entry in store.top(2, HistoryFilter(skill="unity"))] == ["7", "6"]
+    ids = [entry["id"] for entry in store.top(2)]
+    assert store.compare(ids, ["score", "required_skills"]) == {"score": [70, 60],
+                                                                "required_skills": [["Unity"], ["Unity"]]}
+
+
+def test_export_csv(tmp_path):
+    store = filled_store(tmp_path)
+    path = str(tmp_path / "history.csv")
+    assert store.export(path, HistoryFilter(skill="python")) == 2
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["job_id"] for row in rows] == ["1", "2"]
+    assert rows[0]["required_skills"] == "Python; SQL"
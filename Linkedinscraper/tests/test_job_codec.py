@@ -0,0 +1,36 @@
+# Run from Linkedinscraper/: python -m pytest -q tests
+
+from Logic.job_cache import JobCache
+from Logic.job_codec import JobCodec
+
+
+def make_job(i, description="We build data pipelines in Python and SQL for retail clients."):
+    return {"job_info": {"title": f"Data Engineer {i}", "company": "Acme", "description": description},
+            "url": f"https://www.linkedin.com/jobs/view/{i}"}
+
+
+def test_empty_and_missing_descriptions_round_trip():
+    codec = JobCodec()
+    for description in ("", None):
+        job = make_job(1, description)
+        assert codec.decode(codec.encode(job)) == job
+    job = {"url": "no job_info"}
+    assert codec.decode(codec.encode(job)) == job
+
+
+def test_dictionary_trained_by_another_process_is_picked_up(tmp_path):
+    writer = JobCache(str(tmp_path))
+    reader = JobCache(str(tmp_path))
+    writer.put("0", make_job(0))
+    assert reader.get("0") == make_job(0)
+
+    for i in range(1, 300):
+        writer.put(str(i), make_job(i, f"Role {i}: we build data pipelines in Python and SQL, team {i % 7}."))
+    writer.train_dictionary()
+    writer.put("new", make_job(1000))
+    assert writer.codec.dict_id
+
+    # The reader opened the cache before the dictionary existed
+    assert reader.get("new") == make_job(1000)
+    assert reader.peek("new")["job_info"]["title"] == "Data Engineer 1000"
+    assert reader.get("0") == make_job(0)
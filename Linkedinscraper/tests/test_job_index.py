@@ -0,0 +1,47 @@
+# Run from Linkedinscraper/: python -m pytest -q tests
+
+from Logic.job_index import JobIndex
+
+
+def make_job(title, description):
+    return {"job_info": {"title": title, "description": description}}
+
+
+JOBS = {
+    "1": make_job("Data Engineer", "Build Airflow pipelines in Python and SQL on AWS."),
+    "2": make_job("Senior Data Engineer", "Own Python and SQL pipelines with Airflow and dbt on AWS."),
+    "3": make_job("Unity Developer", "Create 3D scenes in Unity and C# for mobile games."),
+}
+
+
+def filled_index(path) -> JobIndex:
+    index = JobIndex(str(path), dim=256)
+    for job_id, job in JOBS.items():
+        index.add(job_id, job)
+    return index
+
+
+def test_similar_jobs_rank_first(tmp_path):
+    index = filled_index(tmp_path)
+    assert index.similar_to_job("1", k=2)[0][0] == "2"
+    assert index.matching_text("Unity C# game developer", k=1)[0][0] == "3"
+
+
+def test_removed_jobs_leave_results_and_stay_removed(tmp_path):
+    index = filled_index(tmp_path)
+    index.remove(["2"])
+    assert "2" not in [job_id for job_id, _ in index.similar_to_job("1", k=3)]
+    reopened = JobIndex(str(tmp_path), dim=256)
+    assert len(reopened) == 2
+    assert "2" not in [job_id for job_id, _ in reopened.matching_text("Airflow dbt pipelines", k=3)]
+
+
+def test_instances_sharing_a_directory_see_each_others_rows(tmp_path):
+    first = JobIndex(str(tmp_path), dim=256)
+    second = JobIndex(str(tmp_path), dim=256)
+    first.add("1", JOBS["1"])
+    second.add("3", JOBS["3"])
+    first.add("2", JOBS["2"])
+    assert second.similar_to_job("1", k=1)[0][0] == "2"
+    assert first.matching_text("Unity C# games", k=1)[0][0] == "3"
+    assert sorted(second.ids) == ["1", "2", "3"]
@@ -0,0 +1,122 @@
+# Run from Linkedinscraper/: python -m pytest -q tests
+
+import asyncio
+import math
+from contextlib import asynccontextmanager
+from typing import List
+
+import pytest
+
+from agents.llm_cache import CachedAgent
+from Logic import rate_limit
+from Logic.rate_limit import RateLimiter
+
+
+class Usage:
+    total_tokens = 10
+
+
+class Result:
+    def __init__(self, output):
+        self.output = output
+
+    def usage(self):
+        return Usage()
+
+
+class ScriptedAgent:
+    """Returns the scripted outputs in order, one per call."""
+
+    def __init__(self, *outputs):
+        self.outputs = list(outputs)
+        self.calls = 0
+
+    async def run(self, prompt):
+        self.calls += 1
+        return Result(self.outputs.pop(0))
+
+    @asynccontextmanager
+    async def run_stream(self, prompt):
+        result = await self.run(prompt)
+
+        class Stream:
+            async def stream(self, debounce_by=None):
+                for _ in range(3):
+                    yield result.output
+
+            async def get_output(self):
+                return result.output
+
+            def usage(self):
+                return Usage()
+
+        yield Stream()
+
+
+@pytest.fixture(autouse=True)
+def unlimited():
+    previous = rate_limit.llm_rate_limiter
+    rate_limit.set_rate_limiter(RateLimiter(rpm=math.inf, tpm=math.inf))
+    yield
+    rate_limit.set_rate_limiter(previous)
+
+
+def make_cached(agent):
+    return CachedAgent(lambda: agent, "fake-model", "system", List[str], name="test")
+
+
+def test_identical_prompts_hit_the_cache():
+    agent = ScriptedAgent(["a"])
+    cached = make_cached(agent)
+    assert asyncio.run(cached.run("job  one")).output == ["a"]
+    assert asyncio.run(cached.run("job one")).output == ["a"]
+    assert agent.calls == 1
+    assert cached.stats()["hits"] == 1
+
+
+def test_empty_output_is_not_cached():
+    agent = ScriptedAgent([], ["a"])
+    cached = make_cached(agent)
+    assert asyncio.run(cached.run("job")).output == []
+    assert asyncio.run(cached.run("job")).output == ["a"]
+    assert agent.calls == 2
+    assert cached.stats()["hits"] == 0
+
+
+def test_invalid_output_is_not_cached_and_refresh_skips_lookup():
+    agent = ScriptedAgent(["a"], ["a", "b"], ["c", "d"])
+    cached = make_cached(agent)
+    two = lambda output: len(output) == 2
+    assert asyncio.run(cached.run("pack", validate=two)).output == ["a"]
+    assert asyncio.run(cached.run("pack", validate=two)).output == ["a", "b"]
+    assert asyncio.run(cached.run("pack", refresh=True, validate=two)).output == ["c", "d"]
+    assert agent.calls == 3
+
+
+def test_extra_run_arguments_are_rejected():
+    cached = make_cached(ScriptedAgent(["a"]))
+    with pytest.raises(TypeError):
+        asyncio.run(cached.run("job", message_history=[]))
+
+
+def test_abandoned_stream_settles_and_does_not_cache():
+    agent = ScriptedAgent(["a"], ["b"])
+    cached = make_cached(agent)
+    settled = []
+    limiter = rate_limit.llm_rate_limiter
+    limiter.settle = lambda reserved, actual: settled.append(actual)
+
+    async def first_partial():
+        stream = cached.stream_output("cv")
+        partial = await stream.__anext__()
+        await stream.aclose()
+        return partial
+
+    assert asyncio.run(first_partial()) == ["a"]
+    assert settled == [Usage.total_tokens]
+
+    async def collect():
+        return [partial async for partial in cached.stream_output("cv")]
+
+    assert asyncio.run(collect())[-1] == ["b"]
+    assert agent.calls == 2
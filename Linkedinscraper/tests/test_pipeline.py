@@ -0,0 +1,37 @@
+# Run from Linkedinscraper/: python -m pytest -q tests
+
+import asyncio
+
+from Logic import pipeline
+
+
+def make_job(job_id):
+    return {"job_info": {"job_id": job_id, "title": f"Job {job_id}",
+                         "job_url": f"https://www.linkedin.com/jobs/view/{job_id}/"}}
+
+
+def test_every_job_gets_a_result_or_an_error(monkeypatch):
+    async def stream_jobs(job_ids):
+        for job_id in job_ids:
+            if job_id != "missing":
+                await asyncio.sleep(0)
+                yield make_job(job_id)
+
+    async def analyze_batch(jobs, user_cv, semaphore):
+        return [ValueError("model said no") if job["job_info"]["job_id"] == "bad"
+                else {"job_id": job["job_info"]["job_id"], "score": 50} for job in jobs]
+
+    monkeypatch.setattr(pipeline, "stream_jobs", stream_jobs)
+    monkeypatch.setattr(pipeline, "analyze_batch", analyze_batch)
+
+    async def run():
+        return [result async for result in pipeline.fetch_and_analyze(
+            ["1", "2", "bad", "missing", "2"], "cv", concurrency=2, batch_size=2, queue_size=2)]
+
+    results = asyncio.run(run())
+    assert len(results) == 4
+    results = {result["job_id"]: result for result in results}
+    assert results["1"] == {"job_id": "1", "score": 50}
+    assert results["bad"] == {"job_id": "bad", "error": "model said no"}
+    assert results["missing"] == {"job_id": "missing", "error": "could not fetch job details"}
+    assert sorted(results) == ["1", "2", "bad", "missing"]
@@ -0,0 +1,47 @@
+# Run from Linkedinscraper/: python -m pytest -q tests
+
+from Logic.prompts import compact, compact_cv, estimate_tokens
+
+POSTING = (
+    "Senior Python Developer\n"
+    "We build data pipelines for retail clients.\n"
+    "You will design ETL jobs in Python and SQL.\n"
+    "Requirements: 5 years experience with Python, Airflow, AWS.\n"
+    "Benefits include health insurance, dental and 401(k)."
+)
+
+
+def test_single_newline_text_keeps_content_and_drops_boilerplate_sentence():
+    result = compact(POSTING, 1200)
+    assert "Requirements: 5 years experience with Python" in result.text
+    assert "Senior Python Developer" in result.text
+    assert "dental" not in result.text
+    assert result.tokens_after > 0
+
+
+def test_boilerplate_section_is_dropped_but_requirements_kept():
+    text = "REQUIREMENTS:\n- Python\n- SQL\n\nBenefits:\n- Dental\n- 401(k) match"
+    assert compact(text, 1200).text == "REQUIREMENTS:\n- Python\n- SQL"
+
+
+def test_never_returns_less_than_hard_cut_of_raw_text():
+    assert compact("We are an equal opportunity employer.", 100).text == "We are an equal opportunity employer."
+    result = compact("x" * 5000, 100)
+    assert result.text == "x" * 400
+    assert estimate_tokens(result.text) <= 100
+
+
+def test_budget_keeps_priority_lines_first():
+    text = "\n".join(f"Filler line number {i} about the company history." for i in range(50))
+    text += "\nMust have: Kubernetes and Terraform."
+    assert "Must have: Kubernetes and Terraform." in compact(text, 30).text
+
+
+def test_cv_keeps_every_line_and_is_not_truncated():
+    experience = "\n".join(f"- Delivered project {i} with Python, benefits analytics and dental claims"
+                           for i in range(300))
+    cv = f"EXPERIENCE:\nSoftware Engineer, Delta Dental\n\n\n\n{experience}\nSoftware   Engineer"
+    text = compact_cv(cv).text
+    assert text.startswith("EXPERIENCE:\nSoftware Engineer, Delta Dental\n\n- Delivered project 0")
+    assert text.count("Delivered project") == 300
+    assert text.endswith("Software Engineer")
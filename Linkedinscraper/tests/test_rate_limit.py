@@ -0,0 +1,49 @@
+# Run from Linkedinscraper/: python -m pytest -q tests
+
+import asyncio
+import math
+import time
+
+from Logic.rate_limit import BATCH, INTERACTIVE, RateLimiter
+
+
+def test_interactive_requests_overtake_queued_batch_work():
+    async def run():
+        limiter = RateLimiter(rpm=1200, tpm=math.inf)  # one request every 50 ms once drained
+        limiter.requests.level = 0
+        order = []
+
+        async def call(name, level):
+            await limiter.acquire(10, level)
+            order.append(name)
+
+        batch = [asyncio.create_task(call(f"batch{i}", BATCH)) for i in range(3)]
+        await asyncio.sleep(0.01)
+        interactive = asyncio.create_task(call("interactive", INTERACTIVE))
+        await asyncio.gather(*batch, interactive)
+        return order
+
+    assert asyncio.run(run())[0] == "interactive"
+
+
+def test_settle_returns_unused_tokens():
+    async def run():
+        limiter = RateLimiter(rpm=math.inf, tpm=1000)
+        reserved = await limiter.acquire(600)
+        before = limiter.tokens.level
+        limiter.settle(reserved, 100)
+        return before, limiter.tokens.level
+
+    before, after = asyncio.run(run())
+    assert after - before == 500
+
+
+def test_429_pauses_every_caller():
+    async def run():
+        limiter = RateLimiter(rpm=math.inf, tpm=math.inf)
+        limiter.observe_headers(429, {"retry-after": "0.2"})
+        start = time.monotonic()
+        await limiter.acquire(10)
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.15
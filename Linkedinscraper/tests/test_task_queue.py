@@ -0,0 +1,34 @@
+# Run from Linkedinscraper/: python -m pytest -q tests
+
+import asyncio
+
+from Logic import task_queue
+from Logic.task_queue import DONE, TaskQueue
+
+
+def test_events_are_capped_and_released_on_finish(monkeypatch):
+    monkeypatch.setattr(task_queue, "TASK_MAX_EVENTS", 5)
+
+    async def handler(payload, emit):
+        for i in range(20):
+            emit({"cv": payload["cv"], "i": i})
+        return "ok"
+
+    async def run():
+        queue = TaskQueue(workers=1, keep_finished=1)
+        queue.register("cv_batch", handler)
+        await queue.start()
+        task = queue.submit("cv_batch", {"cv": "x" * 1000})
+        seen = [event async for event in queue.events(task.id)]
+        second = queue.submit("cv_batch", {"cv": "y"})
+        async for _ in queue.events(second.id):
+            pass
+        await queue.stop()
+        return queue, task, second, seen
+
+    queue, task, second, seen = asyncio.run(run())
+    assert task.status == DONE and task.result == "ok"
+    assert task.payload == {} and task.events == [{"status": DONE, "error": None}]
+    assert task.summary()["progress_events"] == 22
+    assert seen[-1] == {"status": DONE, "error": None}
+    assert queue.get(task.id) is None and queue.get(second.id) is second